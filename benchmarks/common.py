@@ -0,0 +1,90 @@
+"""Shared setup for the standalone benchmark scripts."""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def setup_django(settings_module='blogicum.settings'):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    # settings_prod refuses to start without a secret key.
+    os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmark-only-secret-key')
+    if 'DJANGO_STATIC_ROOT' not in os.environ:
+        static_root = tempfile.mkdtemp(prefix='blogicum-static-')
+        atexit.register(shutil.rmtree, static_root, ignore_errors=True)
+        os.environ['DJANGO_STATIC_ROOT'] = static_root
+    import django
+
+    django.setup()
+    collect_static_files()
+
+
+def collect_static_files():
+    """Run collectstatic when the static storage needs a manifest.
+
+    Manifest storage fails every ``{% static %}`` tag until
+    ``staticfiles.json`` has been written to ``STATIC_ROOT``.
+    """
+    from django.contrib.staticfiles.storage import (
+        ManifestStaticFilesStorage,
+        staticfiles_storage,
+    )
+    from django.core.management import call_command
+
+    if (isinstance(staticfiles_storage, ManifestStaticFilesStorage)
+            and not staticfiles_storage.exists(
+                staticfiles_storage.manifest_name)):
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+
+def timed(func, repeat):
+    """Call ``func`` ``repeat`` times and return the mean time in ms.
+
+    One untimed call warms up template and query caches first.
+    """
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = time.perf_counter() - start
+    return elapsed / repeat * 1000, result
+
+
+def create_test_database():
+    """Create and migrate a throwaway database for the configured settings."""
+    from django.db import connection
+
+    return connection.creation.create_test_db(verbosity=0)
+
+
+def seed_small_dataset(posts=50):
+    """Create one author, category and location with ``posts`` posts."""
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Location, Post
+
+    author = get_user_model().objects.create_user(
+        username='bench', password='bench-password'
+    )
+    category = Category.objects.create(
+        title='Бенчмарк', description='Бенчмарк', slug='bench'
+    )
+    location = Location.objects.create(name='Бенчмарк')
+    now = timezone.now()
+    for number in range(posts):
+        Post.objects.create(
+            title=f'Публикация {number}',
+            text='Текст публикации ' * 50,
+            pub_date=now - timezone.timedelta(minutes=number + 1),
+            author=author,
+            category=category,
+            location=location,
+        )
+    return author
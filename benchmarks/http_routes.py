@@ -0,0 +1,358 @@
+"""Latency, throughput and queries per request for every named route.
+
+Seeds a fixed-size SQLite database with ``seed_blog`` (reused when
+``--db`` points to an existing file), then sends GET requests to every
+named route in ``blog.urls`` and ``pages.urls`` through the project's
+WSGI application from ``--concurrency`` threads. ``blog:add_comment`` is
+POSTed. Routes that require a login are requested with a session of the
+seeded author; the rest anonymously unless ``--user`` is given.
+
+Results go to ``--output`` as JSON. With ``--baseline`` the run is
+compared against an earlier results file and the script exits with
+status 1 when a route's p95 latency grows by more than ``--tolerance``
+or it makes more queries per request.
+
+    python benchmarks/http_routes.py --output current.json
+    python benchmarks/http_routes.py --baseline current.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from io import BytesIO, StringIO
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from common import setup_django
+
+LOGIN_REQUIRED = {
+    'blog:create_post',
+    'blog:edit_post',
+    'blog:delete_post',
+    'blog:add_comment',
+    'blog:edit_comment',
+    'blog:delete_comment',
+    'blog:edit_profile',
+}
+POST_ROUTES = {'blog:add_comment'}
+DATASET = {'users': 200, 'posts': 10_000, 'comments': 50_000, 'seed': 1}
+
+
+def prepare_database(db_path):
+    from django.core.management import call_command
+    from django.db import connections
+
+    exists = Path(db_path).exists()
+    connections['default'].settings_dict['NAME'] = db_path
+    if not exists:
+        call_command('migrate', verbosity=0)
+    call_command('createcachetable', verbosity=0)
+    if not exists:
+        call_command('seed_blog', stdout=StringIO(), **DATASET)
+
+
+def iter_named_routes():
+    """Yield ``(name, converter names)`` for blog.urls and pages.urls."""
+    from django.urls import URLPattern, URLResolver
+
+    from blog import urls as blog_urls
+    from pages import urls as pages_urls
+
+    def walk(patterns, namespace, converters):
+        for pattern in patterns:
+            names = converters | set(pattern.pattern.converters)
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, namespace, names)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                yield f'{namespace}:{pattern.name}', names
+
+    for module in (blog_urls, pages_urls):
+        yield from walk(module.urlpatterns, module.app_name, set())
+
+
+def get_route_kwargs():
+    """Pick objects of the most active author for the URL parameters."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+
+    from blog.models import Comment
+    from blog.utils import select_posts
+
+    author = get_user_model().objects.annotate(
+        post_count=Count('posts'),
+    ).order_by('-post_count').first()
+    post = select_posts(
+        for_public=True, author=author,
+    ).order_by('-comment_count').first()
+    comment = Comment.objects.filter(
+        post=post, author=post.author,
+    ).first() or Comment.objects.create(
+        post=post, author=post.author, text='Комментарий для бенчмарка',
+    )
+    return post.author, {
+        'post_id': post.pk,
+        'comment_id': comment.pk,
+        'category_slug': post.category.slug,
+        'username': post.author.username,
+    }
+
+
+def get_session_cookie(user):
+    from django.conf import settings
+    from django.test import Client
+
+    client = Client()
+    client.force_login(user)
+    return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+class Driver:
+    """Calls the WSGI application and counts the queries it runs."""
+
+    def __init__(self, application, session, csrf_token):
+        from django.conf import settings
+
+        self.application = application
+        self.csrf_token = csrf_token
+        self.cookies = {
+            'logged_in': (
+                f'{settings.SESSION_COOKIE_NAME}={session}; '
+                f'{settings.CSRF_COOKIE_NAME}={csrf_token}'
+            ),
+            'anonymous': '',
+        }
+
+    def environ(self, url, method, cookie):
+        parts = urlsplit(url)
+        body = b''
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'HTTP_HOST': 'localhost',
+            'HTTP_COOKIE': cookie,
+        }
+        if method == 'POST':
+            body = urlencode({'text': 'Комментарий'}).encode()
+            environ.update(
+                CONTENT_TYPE='application/x-www-form-urlencoded',
+                CONTENT_LENGTH=str(len(body)),
+                HTTP_X_CSRFTOKEN=self.csrf_token,
+            )
+        environ['wsgi.input'] = BytesIO(body)
+        setup_testing_defaults(environ)
+        return environ
+
+    def request(self, url, method='GET', logged_in=False):
+        from django.db import connections
+
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        cookie = self.cookies['logged_in' if logged_in else 'anonymous']
+        environ = self.environ(url, method, cookie)
+        status = []
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(count)
+                )
+            start = time.perf_counter()
+            result = self.application(
+                environ, lambda code, headers: status.append(code),
+            )
+            try:
+                for _ in result:
+                    pass
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+            elapsed = time.perf_counter() - start
+        return elapsed * 1000, queries, int(status[0].split()[0])
+
+
+def get_percentiles(latencies):
+    """Return p50/p95/p99 in ms, or ``None`` without enough samples."""
+    if len(latencies) < 2:
+        return dict.fromkeys(('p50_ms', 'p95_ms', 'p99_ms'))
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        f'p{value}_ms': round(cuts[value - 1], 3) for value in (50, 95, 99)
+    }
+
+
+def bench_route(driver, url, method, logged_in, requests, concurrency):
+    from django.db import connections
+
+    samples = []
+    failures = []
+
+    def worker(count):
+        try:
+            for _ in range(count):
+                try:
+                    samples.append(driver.request(url, method, logged_in))
+                except Exception as error:
+                    failures.append(f'{type(error).__name__}: {error}')
+        finally:
+            # Every thread opens its own connections; close them on exit.
+            connections.close_all()
+
+    shares = [
+        requests // concurrency + (index < requests % concurrency)
+        for index in range(concurrency)
+    ]
+    threads = [threading.Thread(target=worker, args=(share,))
+               for share in shares]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    return {
+        'url': url,
+        'method': method,
+        'logged_in': logged_in,
+        'requests': len(samples) + len(failures),
+        'errors': sum(sample[2] >= 400 for sample in samples) + len(failures),
+        'first_exception': failures[0] if failures else None,
+        **get_percentiles([sample[0] for sample in samples]),
+        'requests_per_second': round(len(samples) / wall, 1),
+        'queries_per_request': round(
+            statistics.mean(sample[1] for sample in samples), 2
+        ) if samples else None,
+    }
+
+
+def format_number(value, width, precision=2):
+    if value is None:
+        return f'{"-":>{width}}'
+    return f'{value:>{width}.{precision}f}'
+
+
+def run(args):
+    setup_django(args.settings)
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import reverse
+    from django.utils.crypto import get_random_string
+
+    db_path = args.db or str(Path(tempfile.mkdtemp()) / 'bench.sqlite3')
+    prepare_database(db_path)
+    user, sample_kwargs = get_route_kwargs()
+    driver = Driver(
+        get_wsgi_application(),
+        get_session_cookie(user),
+        get_random_string(32),
+    )
+    routes = {}
+    for name, converters in iter_named_routes():
+        url = reverse(
+            name, kwargs={key: sample_kwargs[key] for key in converters}
+        )
+        method = 'POST' if name in POST_ROUTES else 'GET'
+        logged_in = args.user or name in LOGIN_REQUIRED
+        for _ in range(args.warmup):
+            try:
+                driver.request(url, method, logged_in)
+            except Exception:
+                # Counted with the measured requests below.
+                break
+        routes[name] = bench_route(
+            driver, url, method, logged_in, args.requests, args.concurrency,
+        )
+        result = routes[name]
+        print(
+            f'{name:<22} {format_number(result["p50_ms"], 8)} '
+            f'{format_number(result["p95_ms"], 8)} '
+            f'{format_number(result["p99_ms"], 8)} '
+            f'{result["requests_per_second"]:>8.1f} '
+            f'{format_number(result["queries_per_request"], 8)} '
+            f'{result["errors"]:>6}',
+            file=sys.stderr,
+        )
+        if result['first_exception']:
+            print(f'  {result["first_exception"]}', file=sys.stderr)
+    return {
+        'settings': args.settings,
+        'dataset': DATASET,
+        'concurrency': args.concurrency,
+        'routes': routes,
+    }
+
+
+def compare(baseline, current, tolerance):
+    """Return a description of every route that got slower or chattier."""
+    regressions = []
+    for name, result in current['routes'].items():
+        before = baseline['routes'].get(name)
+        if before is None:
+            continue
+        if result['errors'] > before['errors']:
+            regressions.append(
+                f'{name}: errors {before["errors"]} -> {result["errors"]}'
+            )
+        if None in (
+            result['p95_ms'], before['p95_ms'],
+            result['queries_per_request'], before['queries_per_request'],
+        ):
+            continue
+        if result['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f'{name}: p95 {before["p95_ms"]} -> {result["p95_ms"]} ms'
+            )
+        if result['queries_per_request'] > before['queries_per_request']:
+            regressions.append(
+                f'{name}: queries {before["queries_per_request"]}'
+                f' -> {result["queries_per_request"]}'
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--settings', default='blogicum.settings_prod')
+    parser.add_argument(
+        '--db', help='SQLite file to reuse; seeded when it does not exist.'
+    )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument(
+        '--user',
+        action='store_true',
+        help='Send every request with the author session.',
+    )
+    parser.add_argument('--output', default='http_routes.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(
+        f'{"route":<22} {"p50":>8} {"p95":>8} {"p99":>8} '
+        f'{"req/s":>8} {"queries":>8} {"errors":>6}',
+        file=sys.stderr,
+    )
+    results = run(args)
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(results, output, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline:
+            regressions = compare(json.load(baseline), results, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
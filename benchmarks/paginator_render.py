@@ -0,0 +1,90 @@
+"""Size and render time of a middle feed page as the feed grows.
+
+Fills a throwaway database with posts and requests the middle page of
+the index feed as a logged-in user (anonymous pages come from the page
+cache), once with the elided page window used by the list views and
+once with the full page range the paginator used to loop over. The
+production settings keep the debug toolbar out of the measured pages.
+
+    python benchmarks/paginator_render.py --repeat 20
+"""
+import argparse
+from contextlib import nullcontext
+from unittest import mock
+
+from common import (
+    create_test_database,
+    seed_small_dataset,
+    setup_django,
+    timed,
+)
+
+POST_COUNTS = (1_000, 10_000, 100_000)
+BATCH_SIZE = 5_000
+
+
+def add_posts(author, count):
+    from django.utils import timezone
+
+    from blog.cache import bump_version
+    from blog.models import Category, Post
+    from blog.publication import advance_publication_epoch
+
+    category = Category.objects.get(slug='bench')
+    now = timezone.now()
+    for start in range(0, count, BATCH_SIZE):
+        Post.objects.bulk_create(
+            Post(
+                title=f'Публикация {number}',
+                text='Текст публикации',
+                excerpt='Текст публикации',
+                pub_date=now - timezone.timedelta(minutes=number + 1),
+                author=author,
+                category=category,
+            )
+            for number in range(start, min(start + BATCH_SIZE, count))
+        )
+    # bulk_create sends no signals.
+    bump_version('posts')
+    bump_version('feed')
+    advance_publication_epoch()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django('blogicum.settings_prod')
+    from django.core.paginator import Paginator
+    from django.test import Client
+
+    from blog.models import Post
+    from blog.views import QUANTITY_POSTS
+
+    create_test_database()
+    author = seed_small_dataset(posts=1)
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(author)
+    full_page_range = mock.patch.object(
+        Paginator,
+        'get_elided_page_range',
+        lambda self, *args, **kwargs: self.page_range,
+    )
+
+    print(f'{"posts":>8} {"mode":>7} {"bytes":>9} {"ms":>9}')
+    for post_count in POST_COUNTS:
+        add_posts(author, post_count - Post.objects.count())
+        url = f'/?page={post_count // QUANTITY_POSTS // 2}'
+        for mode in ('elided', 'full'):
+            with full_page_range if mode == 'full' else nullcontext():
+                elapsed, response = timed(lambda: client.get(url), args.repeat)
+            assert response.status_code == 200
+            print(
+                f'{post_count:>8} {mode:>7} '
+                f'{len(response.content):>9} {elapsed:>9.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Per-request overhead of the development and production settings.
+
+Each settings module runs in its own interpreter against a throwaway
+database. The script times GET requests to ``blog:index`` for an
+anonymous visitor (served from the page cache after the first hit) and
+for a logged-in user (the full view, query and template path).
+
+    python benchmarks/settings_overhead.py --requests 500
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from common import (
+    create_test_database,
+    seed_small_dataset,
+    setup_django,
+    timed,
+)
+
+SETTINGS_MODULES = ('blogicum.settings', 'blogicum.settings_prod')
+
+
+def run(settings_module, requests):
+    setup_django(settings_module)
+    from django.test import Client
+    from django.urls import reverse
+
+    create_test_database()
+    author = seed_small_dataset()
+    url = reverse('blog:index')
+    anonymous = Client(HTTP_HOST='localhost')
+    logged_in = Client(HTTP_HOST='localhost')
+    logged_in.force_login(author)
+    results = {}
+    for name, client in (('anonymous', anonymous), ('user', logged_in)):
+        elapsed, response = timed(lambda: client.get(url), requests)
+        results[name] = {
+            'ms_per_request': round(elapsed, 3),
+            'bytes': len(response.content),
+        }
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run(args.run, args.requests)
+        return
+
+    print(f'{"settings":<24} {"client":>10} {"ms/request":>11} {"bytes":>8}')
+    for settings_module in SETTINGS_MODULES:
+        output = subprocess.run(
+            [
+                sys.executable, __file__,
+                '--run', settings_module,
+                '--requests', str(args.requests),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        for client, result in json.loads(output.splitlines()[-1]).items():
+            print(
+                f'{settings_module:<24} {client:>10} '
+                f'{result["ms_per_request"]:>11.3f} {result["bytes"]:>8}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Mixed read / comment-write throughput on SQLite, default vs tuned.
+
+Worker processes share one database file. Each worker loops for
+``--seconds``: with probability ``--write-ratio`` it adds a comment
+(the add_comment write path), otherwise it reads a feed page. The run is
+repeated with the rollback journal and no other pragmas, and with
+``settings.SQLITE_PRAGMAS``. Each run gets a fresh file: WAL mode is
+stored in the database, so a file prepared by the tuned run would stay
+in WAL.
+
+    python benchmarks/sqlite_concurrency.py --workers 8 --seconds 5
+"""
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from common import seed_small_dataset, setup_django
+
+
+def configure(db_path, tuned):
+    setup_django()
+    from django.conf import settings
+    from django.db import connections
+
+    if not tuned:
+        settings.SQLITE_PRAGMAS = {'journal_mode': 'delete'}
+    connections['default'].settings_dict['NAME'] = db_path
+
+
+def prepare(db_path, tuned):
+    configure(db_path, tuned)
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    seed_small_dataset()
+
+
+def worker(db_path, tuned, seconds, write_ratio, seed, results):
+    configure(db_path, tuned)
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError
+
+    from blog.models import Comment, Post
+    from blog.utils import select_posts
+
+    author = get_user_model().objects.get(username='bench')
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    rng = random.Random(seed)
+    reads = writes = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if rng.random() < write_ratio:
+                Comment.objects.create(
+                    text='Комментарий',
+                    author=author,
+                    post_id=rng.choice(post_ids),
+                )
+                writes += 1
+            else:
+                list(select_posts(for_public=True, for_many=True)[:10])
+                reads += 1
+        except OperationalError:
+            errors += 1
+    results.put((reads, writes, errors))
+
+
+def run(tuned, args):
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = str(Path(directory) / 'bench.sqlite3')
+        process = multiprocessing.Process(
+            target=prepare, args=(db_path, tuned)
+        )
+        process.start()
+        process.join()
+        with sqlite3.connect(db_path) as connection:
+            journal_mode = connection.execute(
+                'PRAGMA journal_mode'
+            ).fetchone()[0]
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=worker,
+                args=(
+                    db_path, tuned, args.seconds, args.write_ratio,
+                    seed, results,
+                ),
+            )
+            for seed in range(args.workers)
+        ]
+        for process in workers:
+            process.start()
+        totals = [0, 0, 0]
+        for _ in workers:
+            for index, value in enumerate(results.get()):
+                totals[index] += value
+        for process in workers:
+            process.join()
+    return journal_mode, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(
+        f'{"mode":<8} {"journal":>8} {"reads/s":>9} {"writes/s":>9} '
+        f'{"errors":>7}'
+    )
+    for mode, tuned in (('default', False), ('tuned', True)):
+        journal_mode, (reads, writes, errors) = run(tuned, args)
+        print(
+            f'{mode:<8} {journal_mode:>8} {reads / args.seconds:>9.1f} '
+            f'{writes / args.seconds:>9.1f} {errors:>7}'
+        )
+
+
+if __name__ == '__main__':
+    main()
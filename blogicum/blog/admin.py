@@ -16,6 +16,7 @@ class PostAdmin(admin.ModelAdmin):
         'author',
         'category',
         'is_published',
+        'comment_count',
         'created_at',
     )
     search_fields = (
@@ -51,4 +52,17 @@ class LocationAdmin(admin.ModelAdmin):
     )
 
 
-admin.site.register(Comment)
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = (
+        'text',
+        'author',
+        'created_at',
+    )
+
+    def get_readonly_fields(self, request, obj=None):
+        # Post.comment_count follows only created and deleted comments,
+        # so moving a comment to another post would break both counters.
+        if obj is not None:
+            return ('post',)
+        return ()
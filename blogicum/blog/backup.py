@@ -0,0 +1,153 @@
+import json
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.serializers.python import Deserializer
+from django.db import connections, router, transaction
+
+from blog.models import Category, Comment, Location, Post
+from blog.utils import rebuild_image_blobs
+
+# Referenced models go first so that every row can be inserted as read.
+BACKUP_MODELS = (get_user_model(), Category, Location, Post, Comment)
+
+
+class BackupJSONEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder drops microseconds, which would reorder posts
+    # published within the same millisecond after a round trip.
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_backup_fields(model) -> list:
+    # Many-to-many relations (user groups and permissions) are not backed up.
+    return [
+        field
+        for field in model._meta.local_concrete_fields
+        if not field.primary_key
+    ]
+
+
+def export_blog(stream, chunk_size=2000) -> dict:
+    """Write blog objects to ``stream`` as JSON Lines.
+
+    Each line holds one object in the ``dumpdata`` layout. Rows are read
+    as plain values with ``QuerySet.iterator``, so memory use does not
+    grow with the size of the database. All models are read in one
+    transaction, so objects written meanwhile cannot leave a comment
+    without its post.
+    """
+    using = router.db_for_read(Post)
+    connection = connections[using]
+    outermost = not connection.in_atomic_block
+    counts = {}
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql' and outermost:
+            # READ COMMITTED would take a new snapshot for every query.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ'
+                )
+        for model in BACKUP_MODELS:
+            counts[model._meta.label] = write_records(
+                stream, model, using, chunk_size
+            )
+    return counts
+
+
+def write_records(stream, model, using, chunk_size) -> int:
+    fields = get_backup_fields(model)
+    rows = model._base_manager.using(using).order_by('pk').values_list(
+        'pk', *(field.attname for field in fields)
+    ).iterator(chunk_size)
+    label = model._meta.label_lower
+    count = 0
+    for pk, *values in rows:
+        record = {
+            'model': label,
+            'pk': pk,
+            'fields': {
+                field.name: value
+                for field, value in zip(fields, values)
+            },
+        }
+        stream.write(
+            json.dumps(record, cls=BackupJSONEncoder, ensure_ascii=False)
+            + '\n'
+        )
+        count += 1
+    return count
+
+
+def insert_raw(model, objects) -> None:
+    # Raw inserts keep exported ``created_at`` values: bulk_create() would
+    # overwrite them with the current time because of ``auto_now_add``.
+    using = router.db_for_write(model)
+    fields = model._meta.local_concrete_fields
+    batch_size = max(
+        connections[using].ops.bulk_batch_size(fields, objects), 1
+    )
+    for start in range(0, len(objects), batch_size):
+        model._base_manager.using(using)._insert(
+            objects[start:start + batch_size], fields=fields, raw=True,
+        )
+
+
+def read_records(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def import_blog(stream, batch_size=2000) -> dict:
+    """Load objects written by :func:`export_blog` from ``stream``.
+
+    Lines are parsed lazily and inserted in batches inside a single
+    transaction; the target tables are expected to be empty. Image
+    reference counts are rebuilt from the imported posts.
+    """
+    allowed = {model._meta.label_lower for model in BACKUP_MODELS}
+    counts = {}
+    batch = []
+
+    def flush():
+        if batch:
+            model = type(batch[0])
+            insert_raw(model, batch)
+            counts[model._meta.label] = (
+                counts.get(model._meta.label, 0) + len(batch)
+            )
+            batch.clear()
+
+    with transaction.atomic():
+        for record in read_records(stream):
+            if record.get('model') not in allowed:
+                raise ValueError(f'Unexpected model: {record.get("model")}')
+            obj = next(Deserializer([record])).object
+            if batch and type(batch[0]) is not type(obj):
+                flush()
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+        reset_sequences()
+        rebuild_image_blobs()
+    return counts
+
+
+def reset_sequences() -> None:
+    # Backends with sequences (PostgreSQL) must continue after the
+    # imported ids; SQLite returns no statements here.
+    using = router.db_for_write(Post)
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), BACKUP_MODELS
+    )
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
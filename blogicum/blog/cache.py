@@ -0,0 +1,94 @@
+import time
+from hashlib import md5
+from threading import Lock
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from blog.models import Category
+from blog.publication import get_publication_schedule
+from blogicum.routers import replica_reads_enabled
+
+VERSION_KEY = 'blog:version:{}'
+FEED_PAGE_KEY = 'blog:feed_page:{version}:{epoch}:{signature}'
+
+_published_categories = {}
+_published_categories_lock = Lock()
+
+
+def new_version() -> str:
+    # Prefixed with the bump time, see reads_are_cacheable().
+    return f'{time.time():.3f}:{uuid4().hex}'
+
+
+def get_version(name: str) -> str:
+    # A culled version key must not fall back to a value that old
+    # entries may still be stored under.
+    return cache.get_or_set(VERSION_KEY.format(name), new_version, None)
+
+
+def bump_version(name: str) -> None:
+    # A fresh token instead of incr(): DatabaseCache increments with a
+    # get and a set, so two concurrent bumps could end on one value.
+    cache.set(VERSION_KEY.format(name), new_version(), None)
+
+
+def reads_are_cacheable(name: str) -> bool:
+    """Whether this request's reads may be cached under version ``name``.
+
+    A replica may still miss a write made less than REPLICA_PIN_SECONDS
+    ago, and caching its reads under the version that write created
+    would keep them stale. Only replica reads pay for the lookup.
+    """
+    if not replica_reads_enabled():
+        return True
+    bumped_at = get_version(name).partition(':')[0]
+    try:
+        age = time.time() - float(bumped_at)
+    except ValueError:
+        # A token stored before versions carried their bump time.
+        return True
+    return age >= settings.REPLICA_PIN_SECONDS
+
+
+def get_publication_epoch_key() -> str:
+    return str(get_publication_schedule()['epoch'])
+
+
+def get_feed_page_key(view_name: str, kwargs: dict, params: tuple) -> str:
+    signature = md5(
+        repr((view_name, sorted(kwargs.items()), params)).encode()
+    ).hexdigest()
+    return FEED_PAGE_KEY.format(
+        version=get_version('feed'),
+        epoch=get_publication_epoch_key(),
+        signature=signature,
+    )
+
+
+def get_published_category(slug: str):
+    """Return the published category with ``slug`` or ``None``.
+
+    Hits are kept in process memory for CATEGORY_CACHE_TIMEOUT seconds and
+    dropped whenever a category is saved or deleted in this process.
+    """
+    entry = _published_categories.get(slug)
+    if entry is not None and entry[1] > time.monotonic():
+        return entry[0]
+    category = Category.objects.filter(
+        is_published=True,
+        slug=slug,
+    ).first()
+    if category is not None:
+        with _published_categories_lock:
+            _published_categories[slug] = (
+                category,
+                time.monotonic() + settings.CATEGORY_CACHE_TIMEOUT,
+            )
+    return category
+
+
+def clear_published_categories() -> None:
+    with _published_categories_lock:
+        _published_categories.clear()
@@ -0,0 +1,101 @@
+"""Database-backed queue that moves image variant generation off-request.
+
+Saving a post with a new image only records an ``ImageJob``; the
+``process_image_jobs`` command renders the variants in a process pool.
+Until then the templates fall back to the original upload.
+"""
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from blog.cache import bump_version
+from blog.images import delete_variants, variants_are_current
+from blog.models import ImageJob, Post
+
+MAX_ATTEMPTS = 3
+STALE_AFTER = timedelta(minutes=10)
+
+
+def set_image_variants(post, image_variants) -> None:
+    Post.objects.filter(pk=post.pk).update(image_variants=image_variants)
+    post.image_variants = image_variants
+
+
+def schedule_image_variants(post) -> bool:
+    """Forget outdated variants of ``post`` and queue new ones if needed.
+
+    Variants already rendered for the same file by another post are
+    reused without a job.
+    """
+    if variants_are_current(post) or (
+        not post.image and not post.image_variants
+    ):
+        return False
+    set_image_variants(post, {})
+    ImageJob.objects.filter(
+        post_id=post.pk, status=ImageJob.PENDING,
+    ).exclude(source=post.image.name).delete()
+    if not post.image:
+        return True
+    shared = Post.objects.filter(
+        image=post.image.name,
+        image_variants__source=post.image.name,
+    ).values_list('image_variants', flat=True).first()
+    if shared:
+        set_image_variants(post, shared)
+    else:
+        ImageJob.objects.get_or_create(
+            post_id=post.pk, source=post.image.name, status=ImageJob.PENDING,
+        )
+    return True
+
+
+def requeue_stale_jobs(stale_after=STALE_AFTER) -> int:
+    """Return jobs left running by a worker that died to the queue."""
+    return ImageJob.objects.filter(
+        status=ImageJob.RUNNING,
+        updated_at__lt=timezone.now() - stale_after,
+    ).update(status=ImageJob.PENDING, updated_at=timezone.now())
+
+
+def claim_jobs(limit) -> list:
+    """Mark up to ``limit`` pending jobs as running and return them.
+
+    Each job is claimed with a conditional update, so concurrent workers
+    never process the same job twice.
+    """
+    pks = list(
+        ImageJob.objects.filter(
+            status=ImageJob.PENDING,
+        ).order_by('created_at').values_list('pk', flat=True)[:limit]
+    )
+    claimed = [
+        pk for pk in pks
+        if ImageJob.objects.filter(pk=pk, status=ImageJob.PENDING).update(
+            status=ImageJob.RUNNING,
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now(),
+        )
+    ]
+    return list(ImageJob.objects.filter(pk__in=claimed))
+
+
+def complete_job(job, variants) -> None:
+    # Every post that shares the uploaded file gets the same variants.
+    updated = Post.objects.filter(image=job.source).update(
+        image_variants={'source': job.source, 'variants': variants},
+    )
+    if not updated:
+        # The post was deleted or got another image in the meantime.
+        delete_variants({'variants': variants})
+    job.delete()
+    bump_version('feed')
+
+
+def fail_job(job, error) -> None:
+    job.status = (
+        ImageJob.FAILED if job.attempts >= MAX_ATTEMPTS else ImageJob.PENDING
+    )
+    job.error = f'{type(error).__name__}: {error}'
+    job.save(update_fields=('status', 'error', 'updated_at'))
@@ -0,0 +1,186 @@
+"""Resized JPEG and WebP variants of ``Post.image``.
+
+Variants are stored next to the uploads under ``<dir>/variants/`` and
+described in ``Post.image_variants``::
+
+    {'source': 'posts_images/photo.jpg',
+     'variants': [{'width': 320, 'height': 213,
+                   'jpeg': 'posts_images/variants/photo_320w.jpg',
+                   'webp': 'posts_images/variants/photo_320w.webp'}, ...]}
+
+Templates read only this field, so rendering never opens image files.
+Variants are written with ``default_storage`` under their own names and
+can be shared by every post that uses the same upload.
+"""
+import posixpath
+from base64 import b64encode
+from collections import namedtuple
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageFilter, ImageOps
+
+# Feed cards stop at 640px to keep feed pages light; the detail page also
+# gets a 2x variant of the 40rem card.
+CARD_WIDTHS = (320, 640)
+DETAIL_WIDTHS = (640, 1280)
+VARIANT_WIDTHS = tuple(sorted({*CARD_WIDTHS, *DETAIL_WIDTHS}))
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+# Low-quality image placeholder: a blurred thumbnail inlined as data URI,
+# usually well under 1 KB.
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+# EXIF orientations that rotate the image by 90 degrees.
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+ResponsiveImage = namedtuple(
+    'ResponsiveImage', ('src', 'srcset', 'webp_srcset', 'width', 'height')
+)
+
+
+def get_variant_name(source_name, width, extension):
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'variants', f'{stem}_{width}w.{extension}'
+    )
+
+
+def encode(image, image_format, **options):
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def flatten(image):
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image.convert('RGBA'), mask=image.convert('RGBA'))
+        return background
+    return image.convert('RGB')
+
+
+def make_variants(source_name, widths=VARIANT_WIDTHS):
+    """Write resized variants of ``source_name`` and return their list.
+
+    Images are never upscaled: widths larger than the original collapse
+    into one variant of the original width.
+    """
+    with default_storage.open(source_name, 'rb') as source, \
+            Image.open(source) as original:
+        image = flatten(ImageOps.exif_transpose(original))
+    variants = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        variant = {'width': width, 'height': height}
+        for extension, image_format, options in (
+            ('jpg', 'JPEG', {'quality': JPEG_QUALITY, 'optimize': True,
+                             'progressive': True}),
+            ('webp', 'WEBP', {'quality': WEBP_QUALITY, 'method': 4}),
+        ):
+            name = get_variant_name(source_name, width, extension)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            variant[image_format.lower()] = default_storage.save(
+                name, encode(resized, image_format, **options)
+            )
+        variants.append(variant)
+    return variants
+
+
+def describe_image(field_file):
+    """Return ``(width, height, placeholder)`` of an image field file.
+
+    Files that are already open, such as uploads that are not saved
+    yet, are rewound and left open for the storage. Unreadable files
+    give ``(None, None, '')``.
+    """
+    was_closed = field_file.closed
+    try:
+        field_file.open('rb')
+        with Image.open(field_file) as original:
+            width, height = original.size
+            if original.getexif().get(0x0112) in ROTATED_ORIENTATIONS:
+                width, height = height, width
+            # Lets JPEG decode at a fraction of the full resolution.
+            original.draft('RGB', (PLACEHOLDER_SIZE * 4,) * 2)
+            image = flatten(ImageOps.exif_transpose(original))
+        image.thumbnail((PLACEHOLDER_SIZE,) * 2)
+        image = image.filter(ImageFilter.GaussianBlur(1))
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY)
+    except OSError:
+        return None, None, ''
+    finally:
+        if was_closed:
+            field_file.close()
+        else:
+            field_file.seek(0)
+    placeholder = b64encode(buffer.getvalue()).decode()
+    return width, height, f'data:image/jpeg;base64,{placeholder}'
+
+
+def delete_variants(image_variants):
+    for variant in image_variants.get('variants', ()):
+        for key in ('jpeg', 'webp'):
+            default_storage.delete(variant[key])
+
+
+def variants_are_current(post):
+    return bool(post.image) and (
+        post.image_variants.get('source') == post.image.name
+    )
+
+
+def update_image_variants(post, force=False):
+    """Regenerate the variants of ``post`` when its image has changed.
+
+    Returns ``True`` when the stored description was updated. Files of
+    outdated variants are left to the image reference counting.
+    """
+    if not force and (
+        variants_are_current(post)
+        or (not post.image and not post.image_variants)
+    ):
+        return False
+    image_variants = {}
+    if post.image:
+        image_variants = {
+            'source': post.image.name,
+            'variants': make_variants(post.image.name),
+        }
+    type(post).objects.filter(pk=post.pk).update(
+        image_variants=image_variants
+    )
+    post.image_variants = image_variants
+    return True
+
+
+def get_responsive_image(post, widths):
+    """Return the srcsets for ``widths`` or ``None`` if not generated."""
+    if not variants_are_current(post):
+        return None
+    available = post.image_variants['variants']
+    largest = available[-1]['width']
+    wanted = {min(width, largest) for width in widths}
+    variants = [
+        variant for variant in available if variant['width'] in wanted
+    ]
+
+    def srcset(key):
+        return ', '.join(
+            f'{default_storage.url(variant[key])} {variant["width"]}w'
+            for variant in variants
+        )
+
+    base = variants[0]
+    return ResponsiveImage(
+        src=default_storage.url(base['jpeg']),
+        srcset=srcset('jpeg'),
+        webp_srcset=srcset('webp'),
+        width=base['width'],
+        height=base['height'],
+    )
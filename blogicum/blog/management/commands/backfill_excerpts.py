@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog.utils import backfill_excerpts
+
+
+class Command(BaseCommand):
+    help = 'Заполняет анонсы публикаций для карточек ленты.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций в одном запросе обновления.',
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_excerpts(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {updated}')
+        )
@@ -0,0 +1,51 @@
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from blog.image_jobs import schedule_image_variants
+from blog.images import delete_variants
+from blog.models import Post
+from blog.storage import is_content_addressed
+from blog.utils import rebuild_image_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит изображения публикаций в хранилище с адресацией по '
+        'содержимому и пересчитывает ссылки на файлы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        storage = Post._meta.get_field('image').storage
+        posts = Post.objects.exclude(image='').only(
+            'pk', 'image', 'image_variants'
+        ).order_by('pk')
+        legacy = {}
+        for post in posts.iterator(options['chunk_size']):
+            name = post.image.name
+            if is_content_addressed(name):
+                continue
+            if name not in legacy:
+                if not storage.exists(name):
+                    self.stderr.write(
+                        f'Публикация {post.pk}: нет файла {name}'
+                    )
+                    continue
+                with storage.open(name, 'rb') as source:
+                    legacy[name] = storage.save(name, File(source))
+            delete_variants(post.image_variants)
+            Post.objects.filter(pk=post.pk).update(
+                image=legacy[name], image_variants={},
+            )
+            post.image.name = legacy[name]
+            post.image_variants = {}
+            schedule_image_variants(post)
+        for name in legacy:
+            storage.delete(name)
+
+        blobs = rebuild_image_blobs()
+        self.stdout.write(self.style.SUCCESS(
+            f'Перенесено файлов: {len(legacy)}, всего файлов: {blobs}'
+        ))
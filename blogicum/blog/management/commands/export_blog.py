@@ -0,0 +1,43 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.backup import export_blog
+
+
+def open_output(path):
+    if path == '-':
+        return sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает пользователей, категории, местоположения, '
+        'публикации и комментарии в формате JSON Lines.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            help='Путь к файлу (.jsonl или .jsonl.gz) или «-» для stdout.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Количество объектов, читаемых из базы за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        stream = open_output(options['output'])
+        try:
+            counts = export_blog(stream, chunk_size=options['chunk_size'])
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        for label, count in counts.items():
+            self.stderr.write(f'{label}: {count}')
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import update_image_variants
+from blog.models import IMAGE_METADATA_FIELDS, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные варианты (JPEG и WebP), размеры и заглушки '
+        'изображений публикаций, у которых их ещё нет.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать варианты для всех изображений.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only(
+            'pk', 'image', 'image_variants', *IMAGE_METADATA_FIELDS
+        ).order_by('pk')
+        updated = failed = 0
+        for post in posts.iterator(options['chunk_size']):
+            if options['force'] or post.image_width is None:
+                post.update_image_metadata()
+                Post.objects.filter(pk=post.pk).update(**{
+                    field: getattr(post, field)
+                    for field in IMAGE_METADATA_FIELDS
+                })
+            try:
+                updated += update_image_variants(post, options['force'])
+            except (OSError, ValueError) as error:
+                failed += 1
+                self.stderr.write(f'Публикация {post.pk}: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено публикаций: {updated}, ошибок: {failed}'
+        ))
@@ -0,0 +1,100 @@
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.image_jobs import (
+    claim_jobs,
+    complete_job,
+    fail_job,
+    requeue_stale_jobs,
+)
+from blog.images import make_variants
+
+
+class InlineExecutor:
+    """Runs jobs in the current process; used with ``--workers 0``."""
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def shutdown(self):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Обрабатывает очередь изображений публикаций: создаёт уменьшенные '
+        'варианты в пуле процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Размер пула процессов; 0 — обрабатывать в этом процессе.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Сколько заданий брать за раз (по умолчанию 2 × workers).',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2,
+            help='Пауза между проверками пустой очереди, в секундах.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать очередь и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        workers = options['workers']
+        batch_size = options['batch_size'] or max(workers, 1) * 2
+        requeue_stale_jobs()
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+        executor = (
+            ProcessPoolExecutor(workers) if workers else InlineExecutor()
+        )
+        try:
+            while True:
+                jobs = claim_jobs(batch_size)
+                if jobs:
+                    self.process(executor, jobs)
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            executor.shutdown()
+
+    def process(self, executor, jobs):
+        futures = {
+            executor.submit(make_variants, job.source): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                variants = future.result()
+            except Exception as error:
+                fail_job(job, error)
+                self.stderr.write(f'{job}: {error}')
+            else:
+                complete_job(job, variants)
+                if self.verbosity > 1:
+                    self.stdout.write(f'{job}: готово')
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.publication import advance_publication_epoch
+
+
+class Command(BaseCommand):
+    help = (
+        'Сдвигает эпоху публикаций, когда наступает время отложенной '
+        'публикации, чтобы закэшированные ленты обновились.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Максимальная пауза между проверками, в секундах.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Сдвинуть эпоху один раз и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            schedule = advance_publication_epoch()
+            if options['once']:
+                break
+            delay = options['interval']
+            if schedule['next'] is not None:
+                delay = min(
+                    delay,
+                    schedule['next'] - timezone.now().timestamp(),
+                )
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Следующая проверка через {delay:.1f} с')
+            time.sleep(max(delay, 0))
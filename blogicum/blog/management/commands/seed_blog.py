@@ -0,0 +1,199 @@
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from blog.cache import bump_version, clear_published_categories
+from blog.models import Category, Comment, Location, Post, make_excerpt
+from blog.publication import advance_publication_epoch
+from blog.utils import rebuild_image_blobs, recount_comments
+
+User = get_user_model()
+TEXT_POOL_SIZE = 2000
+PASSWORD = 'blogicum-seed'
+# Publication dates are spread around this moment rather than the current
+# time, so that one seed always gives the same rows.
+DEFAULT_NOW = '2025-01-01T00:00:00+00:00'
+
+
+def parse_now(value):
+    moment = datetime.fromisoformat(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def zipf_cum_weights(size, exponent):
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, size + 1)
+    ))
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу большим объёмом правдоподобных данных: '
+        'пользователи, категории, местоположения, публикации и комментарии.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=500_000)
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Одинаковый seed даёт одинаковые данные.',
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа для авторов и комментариев.',
+        )
+        parser.add_argument(
+            '--now',
+            type=parse_now,
+            default=DEFAULT_NOW,
+            help=(
+                'Момент (ISO 8601), вокруг которого распределяются даты '
+                'публикаций.'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.seed = options['seed']
+        self.rng = random.Random(self.seed)
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = options['now']
+        self.sentences = [
+            self.fake.sentence(nb_words=10) for _ in range(TEXT_POOL_SIZE)
+        ]
+
+        user_ids = self.create_users(options['users'])
+        category_ids = self.create_objects(
+            Category,
+            options['categories'],
+            lambda number: Category(
+                title=self.fake.word().capitalize()[:256],
+                description=self.text(2),
+                slug=f'category-{number}',
+                is_published=self.rng.random() < 0.9,
+            ),
+        )
+        location_ids = self.create_objects(
+            Location,
+            options['locations'],
+            lambda number: Location(
+                name=self.fake.city(),
+                is_published=self.rng.random() < 0.9,
+            ),
+        )
+        author_weights = zipf_cum_weights(len(user_ids), options['zipf'])
+        post_ids = self.create_objects(
+            Post,
+            options['posts'],
+            lambda number: self.make_post(
+                user_ids, author_weights, category_ids, location_ids,
+            ),
+        )
+        post_weights = zipf_cum_weights(len(post_ids), options['zipf'])
+        self.create_objects(
+            Comment,
+            options['comments'],
+            lambda number: Comment(
+                text=self.text(self.rng.randint(1, 3)),
+                author_id=self.rng.choices(
+                    user_ids, cum_weights=author_weights
+                )[0],
+                post_id=self.rng.choices(
+                    post_ids, cum_weights=post_weights
+                )[0],
+            ),
+        )
+
+        self.stdout.write('Пересчёт количества комментариев…')
+        recount_comments(Post.objects.filter(pk__in=post_ids))
+        rebuild_image_blobs()
+        bump_version('posts')
+        bump_version('feed')
+        clear_published_categories()
+        advance_publication_epoch()
+        self.stdout.write(self.style.SUCCESS('Готово.'))
+
+    def text(self, sentences):
+        return ' '.join(self.rng.choices(self.sentences, k=sentences))
+
+    def make_post(self, user_ids, author_weights, category_ids,
+                  location_ids):
+        text = self.text(self.rng.randint(3, 30))
+        return Post(
+            title=self.rng.choice(self.sentences)[:256],
+            text=text,
+            excerpt=make_excerpt(text),
+            pub_date=self.now - timedelta(
+                seconds=self.rng.randint(-7 * 24 * 3600, 365 * 24 * 3600)
+            ),
+            author_id=self.rng.choices(
+                user_ids, cum_weights=author_weights
+            )[0],
+            category_id=self.rng.choice(category_ids),
+            location_id=(
+                self.rng.choice(location_ids)
+                if location_ids and self.rng.random() < 0.8
+                else None
+            ),
+            is_published=self.rng.random() < 0.95,
+        )
+
+    def create_users(self, count):
+        # A fixed salt keeps the hashes identical between runs.
+        password = make_password(PASSWORD, salt=f'seed{self.seed}')
+        return self.create_objects(
+            User,
+            count,
+            lambda number: User(
+                username=f'user{number}',
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                email=f'user{number}@example.com',
+                password=password,
+                date_joined=self.now,
+            ),
+        )
+
+    def create_objects(self, model, count, make_object):
+        """Insert ``count`` objects in chunks and return their ids.
+
+        ``make_object`` gets a number that continues after the largest
+        existing id, so unique fields stay unique on repeated runs.
+        """
+        last_pk = model.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            objects = [
+                make_object(last_pk + 1 + number)
+                for number in range(start, stop)
+            ]
+            with transaction.atomic():
+                model.objects.bulk_create(objects, batch_size=self.batch_size)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: {stop}/{count}'
+            )
+        return list(
+            model.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', flat=True
+            )
+        )
@@ -0,0 +1,33 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blogicum.routers import REPLICA
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную SQLite-базу в файл реплики, чтобы локально '
+        'проверять чтение с реплики.'
+    )
+
+    def handle(self, *args, **options):
+        if REPLICA not in settings.DATABASES:
+            raise CommandError(
+                'Реплика не настроена: задайте BLOGICUM_REPLICA_DB.'
+            )
+        primary = settings.DATABASES['default']
+        replica = settings.DATABASES[REPLICA]
+        if 'sqlite3' not in primary['ENGINE']:
+            raise CommandError('Команда работает только с SQLite.')
+        source = sqlite3.connect(primary['NAME'])
+        target = sqlite3.connect(replica['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(
+            self.style.SUCCESS(f'Реплика обновлена: {replica["NAME"]}')
+        )
@@ -1,11 +1,27 @@
 from django.db import models
+from django.db.models import Q
 from django.urls import reverse_lazy
+from django.utils.text import Truncator
 from django.contrib.auth import get_user_model
 
+from blog.images import (
+    CARD_WIDTHS,
+    DETAIL_WIDTHS,
+    describe_image,
+    get_responsive_image,
+)
+from blog.storage import ContentAddressedStorage
+
 
 User = get_user_model()
 MAX_LENGTH = 256
 LENGTH_OUTPUT = 15
+EXCERPT_WORDS = 10
+IMAGE_METADATA_FIELDS = ('image_width', 'image_height', 'image_placeholder')
+
+
+def make_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
 
 
 class PublishedWithTimeStampModel(models.Model):
@@ -31,6 +47,11 @@ class Post(PublishedWithTimeStampModel):
     text = models.TextField(
         verbose_name='Текст',
     )
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Анонс',
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -59,6 +80,35 @@ class Post(PublishedWithTimeStampModel):
         verbose_name='Фото',
         blank=True,
         upload_to='posts_images',
+        storage=ContentAddressedStorage(),
+    )
+    image_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Ширина фото',
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Высота фото',
+    )
+    image_placeholder = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Заглушка фото',
+    )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Варианты изображения',
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
     )
 
     class Meta:
@@ -66,6 +116,53 @@ class Post(PublishedWithTimeStampModel):
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', )
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=Q(is_published=True),
+                name='post_public_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                condition=Q(is_published=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx',
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        # The excerpt and the image metadata are filled by pre_save
+        # receivers; the excerpt also for the raw saves of loaddata.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'text' in update_fields:
+                update_fields.add('excerpt')
+            if 'image' in update_fields:
+                update_fields.update(IMAGE_METADATA_FIELDS)
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+    def update_image_metadata(self):
+        """Store the size and placeholder of the current image."""
+        if not self.image:
+            self.image_width = self.image_height = None
+            self.image_placeholder = ''
+        else:
+            (
+                self.image_width, self.image_height, self.image_placeholder
+            ) = describe_image(self.image)
+
+    @property
+    def card_image(self):
+        return get_responsive_image(self, CARD_WIDTHS)
+
+    @property
+    def detail_image(self):
+        return get_responsive_image(self, DETAIL_WIDTHS)
 
     def get_absolute_url(self):
         return reverse_lazy(
@@ -140,6 +237,89 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self):
         return f'{self.pk}) {self.text[:LENGTH_OUTPUT]}'
+
+
+class ImageJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Обрабатывается'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        to=Post,
+        on_delete=models.CASCADE,
+        related_name='image_jobs',
+        verbose_name='Публикация',
+    )
+    source = models.CharField(
+        max_length=MAX_LENGTH,
+        verbose_name='Исходное изображение',
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки',
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Ошибка',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено',
+    )
+
+    class Meta:
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'created_at'),
+                name='imagejob_status_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}: {self.source}'
+
+
+class ImageBlob(models.Model):
+    name = models.CharField(
+        max_length=MAX_LENGTH,
+        unique=True,
+        verbose_name='Файл',
+    )
+    refcount = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество публикаций',
+    )
+
+    class Meta:
+        verbose_name = 'файл изображения'
+        verbose_name_plural = 'Файлы изображений'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,213 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+from blog.cache import (
+    get_publication_epoch_key,
+    get_version,
+    reads_are_cacheable,
+)
+
+CURSOR_PARAM = 'cursor'
+NEXT = 'n'
+PREVIOUS = 'p'
+POST_COUNT_KEY = 'blog:post_count:{version}:{epoch}:{signature}'
+
+
+def encode_cursor(obj, direction: str, field: str = 'pub_date') -> str:
+    raw = f'{direction}|{getattr(obj, field).isoformat()}|{obj.pk}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple:
+    try:
+        raw = urlsafe_b64decode(
+            token + '=' * (-len(token) % 4)
+        ).decode()
+        direction, pub_date, pk = raw.split('|')
+        if direction not in (NEXT, PREVIOUS):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(pub_date), int(pk)
+    except (Base64Error, UnicodeDecodeError, ValueError) as error:
+        raise ValueError(f'Invalid cursor: {token!r}') from error
+
+
+class CursorPage:
+    """Page of objects addressed by a (date field, id) keyset cursor."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, has_next, has_previous,
+                 field='pub_date'):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.field = field
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next() and self.object_list:
+            return encode_cursor(self.object_list[-1], NEXT, self.field)
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous() and self.object_list:
+            return encode_cursor(self.object_list[0], PREVIOUS, self.field)
+        return None
+
+
+def paginate_by_cursor(queryset: QuerySet,
+                       token: str,
+                       per_page: int) -> CursorPage:
+    """Return the page of posts following (or preceding) the cursor.
+
+    Posts are ordered newest first by ``(pub_date, id)``, so each page is
+    a range read on the feed indexes instead of an ``OFFSET`` scan.
+    An empty token addresses the first page.
+    """
+    if not token:
+        posts = list(queryset.order_by('-pub_date', '-pk')[:per_page + 1])
+        return CursorPage(
+            posts[:per_page],
+            has_next=len(posts) > per_page,
+            has_previous=False,
+        )
+    direction, pub_date, pk = decode_cursor(token)
+    if direction == NEXT:
+        posts = list(
+            queryset.filter(
+                pub_date__lte=pub_date,
+            ).exclude(
+                pub_date=pub_date,
+                pk__gte=pk,
+            ).order_by('-pub_date', '-pk')[:per_page + 1]
+        )
+        return CursorPage(
+            posts[:per_page],
+            has_next=len(posts) > per_page,
+            has_previous=True,
+        )
+    posts = list(
+        queryset.filter(
+            pub_date__gte=pub_date,
+        ).exclude(
+            pub_date=pub_date,
+            pk__lte=pk,
+        ).order_by('pub_date', 'pk')[:per_page + 1]
+    )
+    return CursorPage(
+        posts[:per_page][::-1],
+        has_next=True,
+        has_previous=len(posts) > per_page,
+    )
+
+
+def paginate_comments(queryset: QuerySet,
+                      token: str,
+                      per_page: int) -> CursorPage:
+    """Return the comments that follow the cursor, oldest first.
+
+    Pages are range reads on the ``(post_id, created_at)`` index; an
+    empty token addresses the first page.
+    """
+    comments = queryset.order_by('created_at', 'pk')
+    if token:
+        direction, created_at, pk = decode_cursor(token)
+        if direction != NEXT:
+            raise ValueError(f'Invalid cursor: {token!r}')
+        comments = comments.filter(
+            created_at__gte=created_at,
+        ).exclude(
+            created_at=created_at,
+            pk__lte=pk,
+        )
+    comments = list(comments[:per_page + 1])
+    return CursorPage(
+        comments[:per_page],
+        has_next=len(comments) > per_page,
+        has_previous=bool(token),
+        field='created_at',
+    )
+
+
+def estimate_count(queryset: QuerySet):
+    """Return the planner's row estimate for the queryset, if available.
+
+    Only PostgreSQL reports a per-query estimate; other backends return
+    ``None`` and the caller falls back to an exact ``COUNT(*)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that caches the total per filter signature.
+
+    Cached totals are versioned and dropped whenever a post or category
+    changes. Large result sets use the planner estimate instead of an
+    exact count.
+    """
+
+    def __init__(self, *args, count_signature=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_signature = count_signature
+
+    def get_exact_or_estimated_count(self):
+        estimate = estimate_count(self.object_list)
+        if (
+            estimate is not None
+            and estimate >= settings.POST_COUNT_ESTIMATE_THRESHOLD
+        ):
+            return estimate
+        return super().count
+
+    @cached_property
+    def count(self):
+        if self.count_signature is None:
+            return super().count
+        key = POST_COUNT_KEY.format(
+            version=get_version('posts'),
+            epoch=get_publication_epoch_key(),
+            signature=self.count_signature,
+        )
+        count = cache.get(key)
+        if count is None:
+            count = self.get_exact_or_estimated_count()
+            if reads_are_cacheable('posts'):
+                cache.set(key, count, settings.POST_COUNT_CACHE_TIMEOUT)
+        return count
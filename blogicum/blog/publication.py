@@ -0,0 +1,80 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from blog.models import Post
+
+SCHEDULE_KEY = 'blog:publication:schedule'
+
+
+def advance_publication_epoch(now=None) -> dict:
+    """Move the publication epoch to ``now`` and find the next deferred post.
+
+    Public queries filter on ``pub_date <= epoch`` instead of the wall
+    clock, so their results (and the caches keyed on the epoch) only
+    change when the epoch moves.
+    """
+    now = now or timezone.now()
+    next_publication = Post.objects.filter(
+        is_published=True,
+        pub_date__gt=now,
+    ).aggregate(next=Min('pub_date'))['next']
+    schedule = {
+        'epoch': now.timestamp(),
+        'next': next_publication.timestamp() if next_publication else None,
+        'checked': now.timestamp(),
+    }
+    cache.set(SCHEDULE_KEY, schedule, None)
+    return schedule
+
+
+def refresh_publication_schedule(schedule: dict, now) -> dict:
+    """Check an old schedule against the database.
+
+    Picks up posts that became visible without advancing the epoch, for
+    example when they were written by a process with another cache or
+    by raw SQL. The epoch only moves when such a post exists, so cached
+    pages survive the check.
+    """
+    epoch = datetime.fromtimestamp(schedule['epoch'], tz=dt_timezone.utc)
+    first_publication = Post.objects.filter(
+        is_published=True,
+        pub_date__gt=epoch,
+    ).aggregate(first=Min('pub_date'))['first']
+    if first_publication is not None and first_publication <= now:
+        return advance_publication_epoch(now)
+    schedule = {
+        **schedule,
+        'next': (
+            first_publication.timestamp() if first_publication else None
+        ),
+        'checked': now.timestamp(),
+    }
+    cache.set(SCHEDULE_KEY, schedule, None)
+    return schedule
+
+
+def get_publication_schedule() -> dict:
+    schedule = cache.get(SCHEDULE_KEY)
+    now = timezone.now()
+    if schedule is None or 'checked' not in schedule or (
+        schedule['next'] is not None
+        and schedule['next'] <= now.timestamp()
+    ):
+        schedule = advance_publication_epoch(now)
+    elif (
+        now.timestamp() - schedule['checked']
+        > settings.PUBLICATION_EPOCH_MAX_AGE
+    ):
+        schedule = refresh_publication_schedule(schedule, now)
+    return schedule
+
+
+def get_publication_epoch() -> datetime:
+    return datetime.fromtimestamp(
+        get_publication_schedule()['epoch'],
+        tz=dt_timezone.utc,
+    )
@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from blog.cache import bump_version, clear_published_categories
+from blog.image_jobs import schedule_image_variants
+from blog.models import Category, Comment, Location, Post, make_excerpt
+from blog.publication import advance_publication_epoch
+from blog.utils import acquire_image, change_comment_count, release_image
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=Post)
+def fill_excerpt(sender, instance, **kwargs):
+    instance.excerpt = make_excerpt(instance.text)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_image(sender, instance, raw=False, **kwargs):
+    # Uploads are renamed, and counted, by the storage in Model.save().
+    instance.assigned_image = instance.image.name
+    instance.previous_image = ''
+    if instance.pk is not None and not raw:
+        instance.previous_image = Post.objects.filter(
+            pk=instance.pk,
+        ).values_list('image', flat=True).first() or ''
+
+
+@receiver(pre_save, sender=Post)
+def describe_new_image(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if (instance.image.name != instance.previous_image
+            or instance.image_width is None):
+        instance.update_image_metadata()
+
+
+@receiver(post_save, sender=Post)
+def post_image_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    uploaded = instance.image.name != instance.assigned_image
+    if instance.previous_image != instance.image.name:
+        if instance.image and not uploaded:
+            acquire_image(instance.image.name)
+        if instance.previous_image:
+            release_image(instance.previous_image, instance.image_variants)
+    elif uploaded:
+        # The same content uploaded again was counted twice.
+        release_image(instance.image.name)
+    schedule_image_variants(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_image_deleted(sender, instance, **kwargs):
+    if instance.image:
+        release_image(instance.image.name, instance.image_variants)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def posts_changed(sender, **kwargs):
+    bump_version('posts')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def publication_schedule_changed(sender, **kwargs):
+    advance_publication_epoch()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def feed_changed(sender, **kwargs):
+    bump_version('feed')
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the feed pages never show.
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        bump_version('feed')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    clear_published_categories()
@@ -0,0 +1,80 @@
+"""Content-addressed storage for post images.
+
+Uploads are stored as ``<upload_to>/<ab>/<sha256><ext>``, where ``ab``
+are the first two hex digits of the hash. Identical uploads therefore
+share one file, and a file never changes once written, so its URL can
+be cached forever. ``ImageBlob`` counts the posts that use each file;
+saving a file takes a reference to it.
+"""
+import hashlib
+import os
+import posixpath
+import re
+from uuid import uuid4
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils.deconstruct import deconstructible
+
+CHUNK_SIZE = 64 * 1024
+# Matches blob names and the variants rendered from them.
+CONTENT_ADDRESSED_NAME = re.compile(
+    r'(^|/)[0-9a-f]{2}/(variants/)?[0-9a-f]{64}(_\d+w)?\.\w+$'
+)
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_ADDRESSED_NAME.search(name))
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage that names files after their SHA-256."""
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save().
+        return name
+
+    def _save(self, name, content):
+        directory, filename = posixpath.split(name)
+        incoming = self.path(directory)
+        os.makedirs(incoming, exist_ok=True)
+        temporary_path = os.path.join(incoming, f'.upload-{uuid4().hex}')
+        digest = hashlib.sha256()
+        try:
+            # Same mode as FileSystemStorage: 0o666 minus the umask.
+            with os.fdopen(
+                os.open(temporary_path, self.OS_OPEN_FLAGS, 0o666), 'wb'
+            ) as temporary:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    temporary.write(chunk)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        hexdigest = digest.hexdigest()
+        extension = posixpath.splitext(filename)[1].lower()
+        name = posixpath.join(
+            directory, hexdigest[:2], f'{hexdigest}{extension}'
+        )
+        full_path = self.path(name)
+        # blog.utils imports the models, which import this module.
+        from blog.utils import acquire_image
+        with transaction.atomic():
+            # Counted before the existence check: the last release of the
+            # same file deletes it under the same row lock, so an existing
+            # file can no longer disappear once it is reused.
+            acquire_image(name)
+            if os.path.exists(full_path):
+                os.remove(temporary_path)
+                return name
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            # Concurrent uploads of the same content write the same bytes,
+            # so whichever rename lands last is still correct.
+            os.replace(temporary_path, full_path)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+        return name
@@ -2,6 +2,7 @@ from django.urls import include, path
 
 from blog.views import (
     post_detail_view,
+    post_comments_view,
     add_comment,
     PostProfileListView,
     ProfileUpdateView,
@@ -23,6 +24,11 @@ post_urls = [
         post_detail_view,
         name='post_detail'
     ),
+    path(
+        '<int:post_id>/comments/',
+        post_comments_view,
+        name='post_comments'
+    ),
     path(
         'create/',
         PostCreateView.as_view(),
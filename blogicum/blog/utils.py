@@ -1,8 +1,18 @@
-from django.utils import timezone
-from django.db.models import Count
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 
-from blog.models import Post
+from blog.images import delete_variants
+from blog.models import ImageBlob, Post, Comment, make_excerpt
+from blog.publication import get_publication_epoch
+from blog.storage import is_content_addressed
 
 
 def select_posts(for_public=False,
@@ -12,15 +22,110 @@ def select_posts(for_public=False,
         'location', 'author', 'category',
     )
     if for_public:
-        now = timezone.now()
         posts = posts.filter(
-            pub_date__lte=now,
+            pub_date__lte=get_publication_epoch(),
             is_published=True,
             category__is_published=True,
         )
     if for_many:
-        posts = posts.annotate(
-            comment_count=Count(
-                'comments'
-            )).order_by('-pub_date')
+        posts = posts.defer('text').order_by('-pub_date')
     return posts.filter(**kwargs)
+
+
+def change_comment_count(post_id, delta) -> None:
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + delta,
+    )
+
+
+def recount_comments(posts=None) -> int:
+    if posts is None:
+        posts = Post.objects.all()
+    comments = Comment.objects.filter(
+        post=OuterRef('pk'),
+    ).order_by().values('post').annotate(
+        count=Count('pk'),
+    ).values('count')
+    return posts.update(
+        comment_count=Coalesce(
+            Subquery(comments, output_field=IntegerField()),
+            0,
+        )
+    )
+
+
+def backfill_excerpts(posts=None, batch_size=1000) -> int:
+    if posts is None:
+        posts = Post.objects.all()
+    updated = 0
+    batch = []
+    for post in posts.only('pk', 'text').iterator(batch_size):
+        post.excerpt = make_excerpt(post.text)
+        batch.append(post)
+        if len(batch) == batch_size:
+            updated += Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    if batch:
+        updated += Post.objects.bulk_update(batch, ['excerpt'])
+    return updated
+
+
+def acquire_image(name) -> None:
+    """Take one reference to an uploaded image.
+
+    The blob row stays locked until the surrounding transaction ends,
+    so a concurrent :func:`release_image` cannot delete the file while
+    the caller decides to reuse it.
+    """
+    while True:
+        if ImageBlob.objects.filter(name=name).update(
+            refcount=F('refcount') + 1,
+        ):
+            return
+        try:
+            with transaction.atomic():
+                ImageBlob.objects.create(name=name, refcount=1)
+            return
+        except IntegrityError:
+            # Another upload created the row first: count on it.
+            continue
+
+
+def release_image(name, image_variants=None) -> bool:
+    """Drop one reference to an uploaded image.
+
+    The file and its variants are deleted with the last reference,
+    before the blob row is unlocked. Images without a blob record
+    (uploaded before deduplication) are left alone.
+    """
+    with transaction.atomic():
+        ImageBlob.objects.filter(name=name, refcount__gt=0).update(
+            refcount=F('refcount') - 1,
+        )
+        deleted, _ = ImageBlob.objects.filter(
+            name=name, refcount=0,
+        ).delete()
+        if not deleted:
+            return False
+        Post._meta.get_field('image').storage.delete(name)
+        if image_variants and image_variants.get('source') == name:
+            delete_variants(image_variants)
+    return True
+
+
+def rebuild_image_blobs() -> int:
+    """Recount the posts that use each content-addressed image.
+
+    Needed after writes that bypass the model signals: raw imports,
+    bulk inserts and migrations of legacy uploads.
+    """
+    counts = Post.objects.exclude(image='').values('image').annotate(
+        refcount=Count('pk'),
+    ).order_by()
+    with transaction.atomic():
+        ImageBlob.objects.all().delete()
+        return len(ImageBlob.objects.bulk_create(
+            ImageBlob(name=row['image'], refcount=row['refcount'])
+            for row in counts
+            if is_content_addressed(row['image'])
+        ))
@@ -1,6 +1,7 @@
 from typing import Any
 
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.urls import reverse_lazy
 from django.db.models.base import Model
 from django.db.models.query import QuerySet
@@ -9,6 +10,9 @@ from django.http.response import HttpResponse
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.shortcuts import (
     redirect,
     render,
@@ -22,6 +26,17 @@ from django.views.generic import (
 )
 
 from blog.utils import select_posts
+from blog.cache import (
+    get_feed_page_key,
+    get_published_category,
+    reads_are_cacheable,
+)
+from blog.pagination import (
+    CURSOR_PARAM,
+    CachedCountPaginator,
+    paginate_by_cursor,
+    paginate_comments,
+)
 from blog.forms import (
     UserModelForm,
     PostModelForm,
@@ -29,50 +44,138 @@ from blog.forms import (
 )
 from blog.models import (
     Post,
-    Category,
     Comment,
 )
 
 
 User = get_user_model()
 QUANTITY_POSTS = 10
+QUANTITY_COMMENTS = 20
+PAGES_ON_EACH_SIDE = 2
+PAGES_ON_ENDS = 1
 
 
-class CommentMixin:
-    model = Comment
-    pk_url_kwarg = 'comment_id'
-    template_name = 'blog/comment.html'
+class AuthorOnlyMixin:
+    """Loads the edited object once and lets only its author through.
+
+    The instance fetched in ``dispatch`` is reused by ``get_object``, so
+    the generic edit views do not query the same row again.
+    """
+
+    def get_instance(self) -> Model:
+        return get_object_or_404(
+            self.model,
+            pk=self.kwargs[self.pk_url_kwarg],
+        )
 
     def dispatch(self,
                  request: HttpRequest,
                  *args: Any,
                  **kwargs: Any) -> HttpResponse:
-        instance = get_object_or_404(
+        self.object = self.get_instance()
+        if self.object.author_id != request.user.id:
+            return redirect('blog:post_detail', post_id=kwargs['post_id'])
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_object(self, queryset: QuerySet[Any] or None = None) -> Model:
+        return self.object
+
+
+class CommentMixin(AuthorOnlyMixin):
+    model = Comment
+    pk_url_kwarg = 'comment_id'
+    template_name = 'blog/comment.html'
+
+    def get_instance(self) -> Comment:
+        return get_object_or_404(
             self.model,
             pk=self.kwargs['comment_id'],
             post_id=self.kwargs['post_id'],
         )
-        if instance.author != request.user:
-            return redirect('blog:post_detail', post_id=kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
 
 
-class PostUpdateDeleteMixin:
+class PostUpdateDeleteMixin(AuthorOnlyMixin):
     model = Post
     pk_url_kwarg = 'post_id'
     template_name = 'blog/create.html'
 
+
+class AnonymousPageCacheMixin:
+    cache_params = ('page', CURSOR_PARAM)
+
     def dispatch(self,
                  request: HttpRequest,
                  *args: Any,
                  **kwargs: Any) -> HttpResponse:
-        instance = get_object_or_404(
-            self.model,
-            pk=self.kwargs['post_id'],
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = get_feed_page_key(
+            request.resolver_match.view_name,
+            kwargs,
+            tuple(request.GET.get(param) for param in self.cache_params),
         )
-        if instance.author != request.user:
-            return redirect('blog:post_detail', post_id=kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: self.cache_page(key, rendered)
+            )
+        return response
+
+    def cache_page(self, key: str, response: HttpResponse) -> None:
+        if reads_are_cacheable('feed'):
+            cache.set(key, response, settings.FEED_PAGE_CACHE_TIMEOUT)
+
+
+class PostPaginationMixin:
+    paginate_by = QUANTITY_POSTS
+    paginator_class = CachedCountPaginator
+
+    def get_count_signature(self) -> str:
+        """Identify the filtered list whose total is cached.
+
+        Defaults to the view name and URL kwargs; override it when the
+        list also depends on the visitor.
+        """
+        return ':'.join((
+            self.request.resolver_match.view_name,
+            *(f'{key}={value}' for key, value in sorted(self.kwargs.items())),
+        ))
+
+    def get_paginator(self, *args: Any, **kwargs: Any) -> Paginator:
+        return super().get_paginator(
+            *args,
+            count_signature=self.get_count_signature(),
+            **kwargs,
+        )
+
+    def paginate_queryset(self,
+                          queryset: QuerySet[Any],
+                          page_size: int) -> tuple:
+        if CURSOR_PARAM not in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        try:
+            page = paginate_by_cursor(
+                queryset,
+                self.request.GET[CURSOR_PARAM],
+                page_size,
+            )
+        except ValueError:
+            raise Http404('Invalid cursor')
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        paginator = context['paginator']
+        if paginator is not None:
+            context['page_range'] = paginator.get_elided_page_range(
+                context['page_obj'].number,
+                on_each_side=PAGES_ON_EACH_SIDE,
+                on_ends=PAGES_ON_ENDS,
+            )
+        return context
 
 
 @login_required
@@ -100,14 +203,13 @@ class CommentUpdateView(LoginRequiredMixin, CommentMixin, UpdateView):
     def get_success_url(self) -> str:
         return reverse_lazy(
             'blog:post_detail',
-            kwargs={'post_id': self.object.post.pk, }
+            kwargs={'post_id': self.object.post_id, }
         )
 
 
-def post_detail_view(request, post_id):
-    posts_qs = select_posts().prefetch_related('comments')
+def get_visible_post(request, post_id):
     post = get_object_or_404(
-        posts_qs,
+        select_posts(),
         pk=post_id,
     )
     if request.user != post.author:
@@ -118,10 +220,27 @@ def post_detail_view(request, post_id):
                 or (post.pub_date > now)
         ):
             raise Http404('Page not found')
+    return post
+
+
+def get_comments_page(request, post):
+    try:
+        return paginate_comments(
+            post.comments.select_related('author'),
+            request.GET.get(CURSOR_PARAM, ''),
+            QUANTITY_COMMENTS,
+        )
+    except ValueError:
+        raise Http404('Invalid cursor')
+
+
+def post_detail_view(request, post_id):
+    post = get_visible_post(request, post_id)
+    comments_page = get_comments_page(request, post)
     context = {
         'post': post,
         'form': CommentModelForm(),
-        'comments': post.comments.select_related('author'),
+        'comments': comments_page,
     }
     return render(
         request,
@@ -130,6 +249,24 @@ def post_detail_view(request, post_id):
     )
 
 
+def post_comments_view(request, post_id):
+    post = get_visible_post(request, post_id)
+    comments_page = get_comments_page(request, post)
+    context = {
+        'post': post,
+        'comments': comments_page,
+    }
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        template_name = 'includes/comment_list.html'
+    else:
+        template_name = 'blog/comments.html'
+    return render(
+        request,
+        template_name,
+        context,
+    )
+
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     template_name = 'blog/create.html'
     form_class = PostModelForm
@@ -164,25 +301,29 @@ class PostDeleteView(LoginRequiredMixin, PostUpdateDeleteMixin, DeleteView):
     success_url = reverse_lazy('blog:index')
 
 
-class PostListView(ListView):
+class PostListView(AnonymousPageCacheMixin,
+                   PostPaginationMixin,
+                   ListView):
     template_name = 'blog/index.html'
-    paginate_by = QUANTITY_POSTS
-    queryset = select_posts(
-        for_public=True,
-        for_many=True,
-    )
+
+    def get_queryset(self) -> QuerySet[Any]:
+        return select_posts(
+            for_public=True,
+            for_many=True,
+        )
 
 
-class PostByCategoryListView(ListView):
+class PostByCategoryListView(AnonymousPageCacheMixin,
+                             PostPaginationMixin,
+                             ListView):
     template_name = 'blog/category.html'
-    paginate_by = QUANTITY_POSTS
 
-    @property
+    @cached_property
     def get_category(self):
-        return get_object_or_404(
-            Category.objects.filter(is_published=True),
-            slug=self.kwargs['category_slug']
-        )
+        category = get_published_category(self.kwargs['category_slug'])
+        if category is None:
+            raise Http404('Category not found')
+        return category
 
     def get_queryset(self) -> QuerySet[Any]:
         return select_posts(
@@ -197,17 +338,24 @@ class PostByCategoryListView(ListView):
         return context
 
 
-class PostProfileListView(ListView):
+class PostProfileListView(AnonymousPageCacheMixin,
+                          PostPaginationMixin,
+                          ListView):
     template_name = 'blog/profile.html'
-    paginate_by = QUANTITY_POSTS
 
-    @property
+    @cached_property
     def get_profile(self):
         return get_object_or_404(
             User,
             username=self.kwargs['username']
         )
 
+    def get_count_signature(self) -> str:
+        profile = self.get_profile
+        if self.request.user == profile:
+            return f'author:{profile.pk}:all'
+        return f'author:{profile.pk}:public'
+
     def get_queryset(self) -> QuerySet[Any]:
         profile = self.get_profile
         return select_posts(
@@ -0,0 +1,106 @@
+"""In-process request metrics collected by ``RequestMetricsMiddleware``."""
+import statistics
+from collections import deque, namedtuple
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.template.backends import django as django_backend
+
+RequestMetrics = namedtuple(
+    'RequestMetrics',
+    (
+        'view_name', 'method', 'status', 'total_ms', 'db_ms', 'queries',
+        'template_ms', 'size',
+    ),
+)
+PERCENTILES = (50, 95, 99)
+TIMED_FIELDS = ('total_ms', 'db_ms', 'template_ms')
+
+records = deque(maxlen=settings.REQUEST_METRICS_BUFFER_SIZE)
+# [seconds spent rendering, nesting depth] of the sampled request.
+template_timing = ContextVar('template_timing', default=None)
+_original_render = django_backend.Template.render
+
+
+def _timed_render(self, context=None, request=None):
+    timing = template_timing.get()
+    if timing is None:
+        return _original_render(self, context, request)
+    timing[1] += 1
+    start = perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        timing[1] -= 1
+        if not timing[1]:
+            timing[0] += perf_counter() - start
+
+
+def instrument_templates():
+    """Time top-level renders of the Django template backend."""
+    django_backend.Template.render = _timed_render
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts queries and their total time."""
+
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += perf_counter() - start
+            self.count += 1
+
+
+def get_percentiles(values):
+    if len(values) == 1:
+        return dict.fromkeys(PERCENTILES, round(values[0], 3))
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return {
+        percentile: round(cuts[percentile - 1], 3)
+        for percentile in PERCENTILES
+    }
+
+
+def summarize(snapshot):
+    """Aggregate records into per-view percentiles."""
+    by_view = {}
+    for record in snapshot:
+        by_view.setdefault(record.view_name, []).append(record)
+    summary = {}
+    for view_name, view_records in sorted(by_view.items()):
+        summary[view_name] = {
+            'requests': len(view_records),
+            'errors': sum(record.status >= 500 for record in view_records),
+            'queries': get_percentiles(
+                [record.queries for record in view_records]
+            ),
+            'size': get_percentiles(
+                [record.size for record in view_records]
+            ),
+        }
+        for field in TIMED_FIELDS:
+            summary[view_name][field] = get_percentiles(
+                [getattr(record, field) for record in view_records]
+            )
+    return summary
+
+
+@staff_member_required
+def request_metrics_view(request):
+    snapshot = records.copy()
+    return JsonResponse({
+        'sample_rate': settings.REQUEST_METRICS_SAMPLE_RATE,
+        'records': len(snapshot),
+        'views': summarize(snapshot),
+    })
@@ -0,0 +1,219 @@
+import json
+import logging
+import random
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from blog.storage import is_content_addressed
+from blogicum import metrics
+from blogicum.staticfiles import get_accepted_encodings, get_static_files
+from blogicum.routers import enable_replica_reads, reset_replica_reads
+
+PRIMARY_PIN_COOKIE = 'primary_pin'
+SAFE_METHODS = ('GET', 'HEAD')
+
+metrics_logger = logging.getLogger('blogicum.metrics')
+
+
+class StaticCacheControlMiddleware:
+    """Adds public caching headers to static and media responses.
+
+    Content-addressed media files never change, so they are marked
+    immutable and cached for ``IMMUTABLE_CACHE_MAX_AGE``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = (
+            (settings.STATIC_URL, settings.STATIC_CACHE_MAX_AGE),
+            (settings.MEDIA_URL, settings.MEDIA_CACHE_MAX_AGE),
+        )
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.status_code != 200
+            or response.has_header('Cache-Control')
+        ):
+            return response
+        if (
+            request.path.startswith(settings.MEDIA_URL)
+            and is_content_addressed(request.path)
+        ):
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.IMMUTABLE_CACHE_MAX_AGE,
+                immutable=True,
+            )
+            return response
+        for prefix, max_age in self.rules:
+            if request.path.startswith(prefix):
+                patch_cache_control(response, public=True, max_age=max_age)
+                break
+        return response
+
+
+class StaticFilesMiddleware:
+    """Serves ``STATIC_ROOT`` when there is no separate web server.
+
+    Picks the ``.br`` or ``.gz`` sibling written by ``collectstatic``
+    according to ``Accept-Encoding``. Fingerprinted files listed in the
+    manifest are cached as immutable. Enabled by ``SERVE_STATIC``; the
+    file index is built on startup, so run ``collectstatic`` first.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVE_STATIC:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.files = get_static_files(settings.STATIC_ROOT)
+
+    def __call__(self, request):
+        static_file = None
+        if (
+            request.method in SAFE_METHODS
+            and request.path.startswith(self.prefix)
+        ):
+            static_file = self.files.get(request.path[len(self.prefix):])
+        if static_file is None:
+            return self.get_response(request)
+        return self.serve(request, static_file)
+
+    def serve(self, request, static_file):
+        accepted = get_accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        path, size, encoding = static_file.path, static_file.size, None
+        for coding, encoded in static_file.encodings.items():
+            if coding in accepted:
+                path, size, encoding = encoded.path, encoded.size, coding
+                break
+        if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'), static_file.mtime
+        ):
+            response = HttpResponseNotModified()
+        elif request.method == 'HEAD':
+            response = HttpResponse(content_type=static_file.content_type)
+            response['Content-Length'] = size
+        else:
+            response = FileResponse(
+                open(path, 'rb'), content_type=static_file.content_type
+            )
+            response['Content-Length'] = size
+            del response['Content-Disposition']
+        response['Last-Modified'] = http_date(static_file.mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if static_file.encodings:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        if static_file.immutable:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.IMMUTABLE_CACHE_MAX_AGE,
+                immutable=True,
+            )
+        else:
+            patch_cache_control(
+                response, public=True, max_age=settings.STATIC_CACHE_MAX_AGE,
+            )
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Lets the views in ``REPLICA_VIEWS`` read from the replica.
+
+    A client that has just written (any successful unsafe request) gets
+    a short-lived cookie that keeps its following requests, such as the
+    redirect after ``add_comment``, on the primary database. Other
+    clients keep reading the replica; what they read within
+    REPLICA_PIN_SECONDS of a write is not cached (see
+    ``blog.cache.reads_are_cacheable``).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                reset_replica_reads(request.replica_token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and request.resolver_match.view_name in settings.REPLICA_VIEWS
+            and PRIMARY_PIN_COOKIE not in request.COOKIES
+        ):
+            request.replica_token = enable_replica_reads()
+
+
+class RequestMetricsMiddleware:
+    """Samples per-request timings into ``blogicum.metrics.records``.
+
+    A sampled request records its view name, total, database and template
+    time, query count and response size. The record is also logged as
+    JSON to the ``blogicum.metrics`` logger when it is enabled for INFO.
+    Unsampled requests only pay for one ``random()`` call.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        metrics.instrument_templates()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        timer = metrics.QueryTimer()
+        timing = [0.0, 0]
+        token = metrics.template_timing.set(timing)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            metrics.template_timing.reset(token)
+        total = perf_counter() - start
+        match = request.resolver_match
+        record = metrics.RequestMetrics(
+            view_name=match.view_name if match else '<unresolved>',
+            method=request.method,
+            status=response.status_code,
+            total_ms=total * 1000,
+            db_ms=timer.seconds * 1000,
+            queries=timer.count,
+            template_ms=timing[0] * 1000,
+            size=(
+                int(response.get('Content-Length', 0))
+                if response.streaming else len(response.content)
+            ),
+        )
+        metrics.records.append(record)
+        if metrics_logger.isEnabledFor(logging.INFO):
+            metrics_logger.info(json.dumps(record._asdict()))
+        return response
@@ -0,0 +1,49 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+
+REPLICA = 'replica'
+# DatabaseCache entries; cache reads must never see a lagging replica.
+CACHE_APP_LABEL = 'django_cache'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def enable_replica_reads():
+    """Route reads to the replica until the returned token is reset."""
+    return _replica_reads.set(True)
+
+
+def reset_replica_reads(token) -> None:
+    _replica_reads.reset(token)
+
+
+def replica_reads_enabled() -> bool:
+    """Whether reads of the current request go to a configured replica."""
+    return _replica_reads.get() and REPLICA in settings.DATABASES
+
+
+class ReplicaRouter:
+    """Sends reads to the replica inside read-only views, writes to primary.
+
+    Replica reads are switched on per request by
+    ``ReplicaRoutingMiddleware``; everything else, including management
+    commands and requests pinned to the primary, uses ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            replica_reads_enabled()
+            and model._meta.app_label != CACHE_APP_LABEL
+        ):
+            return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
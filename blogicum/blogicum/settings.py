@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -32,6 +33,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blogicum.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -60,11 +62,53 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'blogicum.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
 
+# Read replica for the feed and detail views. Locally this can be a second
+# SQLite file refreshed with `python manage.py sync_replica`.
+if os.environ.get('BLOGICUM_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'blogicum.backends.sqlite3',
+        'NAME': os.environ['BLOGICUM_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+# The development server runs one process, so a local cache sees every
+# version bump. settings_prod configures a cache shared by all workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+REPLICA_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+    'blog:post_comments',
+)
+
+# Seconds a client stays on the primary after a write; replica reads made
+# this soon after a write are not cached.
+REPLICA_PIN_SECONDS = 10
+
+# Applied to every new SQLite connection. WAL lets readers run while a
+# comment or post is being written; busy_timeout makes writers wait for
+# the lock instead of failing at once.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -111,3 +155,25 @@ LOGIN_URL = 'login'
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 INTERNAL_IPS = ['127.0.0.1', ]
+
+POST_COUNT_CACHE_TIMEOUT = 60
+
+POST_COUNT_ESTIMATE_THRESHOLD = 100_000
+
+FEED_PAGE_CACHE_TIMEOUT = 300
+
+CATEGORY_CACHE_TIMEOUT = 60
+
+# Seconds after which the cached publication epoch is checked against
+# the database, in case a post was published without advancing it.
+PUBLICATION_EPOCH_MAX_AGE = 5
+
+SERVE_MEDIA = False
+
+SERVE_STATIC = False
+
+# RequestMetricsMiddleware: share of sampled requests and the number of
+# recent records kept for the staff metrics page.
+REQUEST_METRICS_SAMPLE_RATE = 1.0
+
+REQUEST_METRICS_BUFFER_SIZE = 5000
@@ -0,0 +1,109 @@
+"""Production settings.
+
+Select with ``DJANGO_SETTINGS_MODULE=blogicum.settings_prod``.
+"""
+import os
+from copy import deepcopy
+
+from django.core.exceptions import ImproperlyConfigured
+
+from blogicum.settings import *  # noqa: F401, F403
+from blogicum.settings import (
+    BASE_DIR,
+    DATABASES,
+    INSTALLED_APPS,
+    TEMPLATES,
+)
+
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set the DJANGO_SECRET_KEY variable.')
+
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in ('debug_toolbar', 'django_extensions')
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'blogicum.middleware.StaticFilesMiddleware',
+    # After the static files, which would all be sampled as unresolved.
+    'blogicum.middleware.RequestMetricsMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
+    'blogicum.middleware.StaticCacheControlMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blogicum.middleware.ReplicaRoutingMiddleware',
+]
+
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+    'django.template.context_processors.debug'
+)
+
+DATABASES = deepcopy(DATABASES)
+DATABASES['default']['CONN_MAX_AGE'] = 600
+
+# The page, count and publication caches must be shared by all workers:
+# Memcached when DJANGO_MEMCACHED_LOCATION is set, otherwise the
+# database cache table (`python manage.py createcachetable`).
+if os.environ.get('DJANGO_MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['DJANGO_MEMCACHED_LOCATION'].split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'blogicum_cache',
+            'OPTIONS': {'MAX_ENTRIES': 50000},
+        }
+    }
+
+MEDIA_URL = '/media/'
+
+# Uploads are best served by the web server; enable for setups without
+# one.
+SERVE_MEDIA = os.environ.get('DJANGO_SERVE_MEDIA', '0') == '1'
+
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', BASE_DIR / 'static')
+
+STATICFILES_STORAGE = (
+    'blogicum.staticfiles.CompressedManifestStaticFilesStorage'
+)
+
+# Serve collected static files from the application process; disable
+# when a web server in front of it handles /static/.
+SERVE_STATIC = os.environ.get('DJANGO_SERVE_STATIC', '1') == '1'
+
+STATIC_CACHE_MAX_AGE = 60 * 60 * 24
+
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+
+IMMUTABLE_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+REQUEST_METRICS_SAMPLE_RATE = float(
+    os.environ.get('DJANGO_METRICS_SAMPLE_RATE', '0.1')
+)
@@ -0,0 +1,133 @@
+"""Fingerprinted, precompressed static files.
+
+``collectstatic`` with ``CompressedManifestStaticFilesStorage`` writes
+hashed copies, the ``staticfiles.json`` manifest and ``.br`` and ``.gz``
+siblings of text files. ``brotli`` is pinned in requirements.txt; an
+environment without it still gets the ``.gz`` files.
+``StaticFilesMiddleware`` serves ``STATIC_ROOT`` from the application
+process using the index built by ``get_static_files``.
+"""
+import gzip
+import json
+import mimetypes
+import os
+from collections import namedtuple
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.json', '.xml', '.html',
+)
+# Smaller gains are not worth a second file and a Vary header.
+MIN_COMPRESSION_RATIO = 0.95
+# Content-Encoding values by preference, with the sibling file suffix.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+ENCODED_SUFFIXES = tuple(suffix for _, suffix in ENCODINGS)
+
+StaticFile = namedtuple(
+    'StaticFile', ('path', 'size', 'mtime', 'content_type', 'immutable',
+                   'encodings'),
+)
+EncodedFile = namedtuple('EncodedFile', ('path', 'size'))
+
+
+def compress(data):
+    """Yield ``(suffix, compressed bytes)`` for the available encoders."""
+    if brotli is not None:
+        yield '.br', brotli.compress(data, quality=11)
+    yield '.gz', gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes compressed siblings."""
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        # Only the final names: files with references are hashed in
+        # several passes and the intermediate copies are not kept.
+        for hashed_name in sorted(set(self.hashed_files.values())):
+            self.write_compressed(hashed_name)
+
+    def write_compressed(self, name):
+        if not name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as original:
+            data = original.read()
+        for suffix, compressed in compress(data):
+            path = self.path(name + suffix)
+            if len(compressed) >= len(data) * MIN_COMPRESSION_RATIO:
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            with open(path, 'wb') as target:
+                target.write(compressed)
+
+
+def get_accepted_encodings(header):
+    """Return the codings of an ``Accept-Encoding`` header with q > 0."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        quality = params.strip()
+        if not coding:
+            continue
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def get_hashed_names(root):
+    try:
+        with open(os.path.join(root, 'staticfiles.json')) as manifest:
+            return set(json.load(manifest)['paths'].values())
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+def get_static_files(root):
+    """Index ``root`` by URL path relative to ``STATIC_URL``.
+
+    The index is built once, so requests never touch the file system
+    for unknown paths and cannot escape ``root``.
+
+    Compressed siblings are attached to the file they were made from
+    and are not served under their own names.
+    """
+    hashed_names = get_hashed_names(root)
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(ENCODED_SUFFIXES):
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            stat = os.stat(path)
+            encodings = {}
+            for encoding, suffix in ENCODINGS:
+                if os.path.exists(path + suffix):
+                    encodings[encoding] = EncodedFile(
+                        path + suffix, os.path.getsize(path + suffix)
+                    )
+            files[name] = StaticFile(
+                path=path,
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+                content_type=(
+                    mimetypes.guess_type(filename)[0]
+                    or 'application/octet-stream'
+                ),
+                immutable=name in hashed_names,
+                encodings=encodings,
+            )
+    return files
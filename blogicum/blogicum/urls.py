@@ -1,11 +1,16 @@
+import re
+
 from django.contrib import admin
 from django.conf import settings
 from django.urls import reverse_lazy
-from django.urls import path, include
+from django.urls import path, include, re_path
+from django.views.static import serve
 from django.conf.urls.static import static
 from django.views.generic.edit import CreateView
 from django.contrib.auth.forms import UserCreationForm
 
+from blogicum.metrics import request_metrics_view
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
@@ -13,6 +18,11 @@ handler500 = 'pages.views.server_error'
 urlpatterns = [
     path('', include('blog.urls', namespace='blog')),
     path('admin/', admin.site.urls),
+    path(
+        'internal/metrics/',
+        request_metrics_view,
+        name='request_metrics',
+    ),
     path('pages/', include('pages.urls', namespace='pages')),
     path('auth/', include('django.contrib.auth.urls')),
     path(
@@ -32,3 +42,11 @@ if settings.DEBUG:
         settings.MEDIA_URL,
         document_root=settings.MEDIA_ROOT,
     )
+elif settings.SERVE_MEDIA:
+    urlpatterns.append(
+        re_path(
+            r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+            serve,
+            kwargs={'document_root': settings.MEDIA_ROOT},
+        )
+    )
@@ -0,0 +1,30 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+
+def make_image(width=400, height=300, color=(73, 109, 137),
+               name='photo.jpg'):
+    img_io = BytesIO()
+    Image.new('RGB', (width, height), color=color).save(
+        img_io, format='JPEG'
+    )
+    return ImageFile(img_io, name=name)
+
+
+def process_image_jobs(workers=0):
+    call_command(
+        'process_image_jobs', '--once', f'--workers={workers}',
+        stdout=StringIO(),
+    )
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    """Keep the uploads and variants of a test in a temporary directory."""
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
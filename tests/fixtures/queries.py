@@ -0,0 +1,88 @@
+from contextlib import ExitStack
+from typing import Callable, Tuple
+
+import pytest
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Maximum number of SQL queries per request for each view in `blog.urls`,
+# measured for a logged-in author with empty caches.
+QUERY_BUDGETS = {
+    'blog:index': 5,
+    'blog:category_posts': 6,
+    'blog:profile': 6,
+    'blog:post_detail': 4,
+    'blog:post_comments': 4,
+    'blog:create_post': 4,
+    'blog:edit_post': 5,
+    'blog:delete_post': 3,
+    'blog:add_comment': 5,
+    'blog:edit_comment': 3,
+    'blog:delete_comment': 3,
+    'blog:edit_profile': 2,
+}
+
+QueryRecorderT = Callable[..., Tuple[HttpResponse, list]]
+
+
+def capture_queries(client: Client, url: str, method: str = 'get',
+                    **kwargs) -> Tuple[HttpResponse, list]:
+    """Send a request and return it with the SQL of every connection."""
+    with ExitStack() as stack:
+        contexts = [
+            stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in connections
+        ]
+        response = getattr(client, method)(url, **kwargs)
+    queries = [
+        query['sql']
+        for context in contexts
+        for query in context.captured_queries
+    ]
+    return response, queries
+
+
+def get_page_queries(client: Client, url: str) -> list:
+    """Return the SQL of a page that must load without errors."""
+    response, queries = capture_queries(client, url)
+    assert response.status_code == 200, (
+        f'Убедитесь, что страница `{url}` загружается без ошибок.'
+    )
+    return queries
+
+
+@pytest.fixture
+def record_queries() -> QueryRecorderT:
+    """Send a request with cold caches and return it with its SQL."""
+    from blog.cache import clear_published_categories
+
+    def record(client: Client, url: str, method: str = 'get', **kwargs):
+        cache.clear()
+        clear_published_categories()
+        return capture_queries(client, url, method, **kwargs)
+
+    return record
+
+
+@pytest.fixture
+def assert_query_budget(record_queries: QueryRecorderT) -> Callable:
+    def check(client: Client, view_name: str, method: str = 'get',
+              data=None, **kwargs) -> list:
+        url = reverse(view_name, kwargs=kwargs)
+        response, queries = record_queries(client, url, method, data=data)
+        assert response.status_code < 400, (
+            f'Убедитесь, что страница `{url}` загружается без ошибок.'
+        )
+        budget = QUERY_BUDGETS[view_name]
+        assert len(queries) <= budget, (
+            f'Страница `{url}` ({view_name}) выполняет {len(queries)}'
+            f' запросов к базе данных при допустимых {budget}:\n'
+            + '\n'.join(queries)
+        )
+        return queries
+
+    return check
@@ -0,0 +1,43 @@
+import pytest
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_admin_cannot_move_comment_to_another_post(
+        admin_client, mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    other_post = mixer.blend('blog.Post')
+    comment = mixer.blend('blog.Comment', post=post)
+    response = admin_client.post(
+        f'/admin/blog/comment/{comment.id}/change/',
+        {
+            'text': 'Изменённый комментарий',
+            'author': comment.author_id,
+            'post': other_post.id,
+        },
+    )
+    assert response.status_code == 302
+    comment.refresh_from_db()
+    assert comment.text == 'Изменённый комментарий'
+    assert comment.post_id == post.id, (
+        'Убедитесь, что в админке нельзя перенести комментарий к другой'
+        ' публикации: счётчики комментариев обеих публикаций разошлись бы'
+        ' с действительностью.'
+    )
+    counts = dict(Post.objects.values_list('pk', 'comment_count'))
+    assert counts[post.id] == 1 and counts[other_post.id] == 0
+
+
+def test_admin_adds_comment_to_chosen_post(
+        admin_client, mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    response = admin_client.post(
+        '/admin/blog/comment/add/',
+        {'text': 'Комментарий', 'author': post.author_id, 'post': post.id},
+    )
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.comment_count == 1
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post, make_excerpt
+
+pytestmark = [pytest.mark.django_db]
+
+SAMPLE_DATA = Path(__file__).resolve().parent.parent / 'db.json'
+
+
+def test_loaddata_fills_excerpts():
+    call_command('loaddata', SAMPLE_DATA, verbosity=0)
+    posts = Post.objects.only('text', 'excerpt')
+    assert posts.exists()
+    for post in posts:
+        assert post.excerpt == make_excerpt(post.text), (
+            'Убедитесь, что анонс публикации заполняется и при загрузке'
+            ' данных командой `loaddata`.'
+        )
+
+
+def test_excerpt_follows_text_on_partial_save(mixer):
+    post = mixer.blend('blog.Post', text='старый текст')
+    post.text = 'новый текст публикации'
+    post.save(update_fields=['text'])
+    post.refresh_from_db()
+    assert post.excerpt == 'новый текст публикации'
@@ -0,0 +1,141 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from mixer.backend.django import Mixer
+
+from blog.backup import BACKUP_MODELS, export_blog, import_blog
+from blog.models import ImageBlob, Post
+from blog.storage import is_content_addressed
+from blogicum.middleware import StaticCacheControlMiddleware
+from fixtures.images import make_image, process_image_jobs
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('media_root')]
+
+
+def blend_post(mixer, image):
+    post = mixer.blend('blog.Post', image=image)
+    process_image_jobs()
+    post.refresh_from_db()
+    return post
+
+
+def test_identical_uploads_share_one_file(mixer: Mixer, media_root):
+    first = blend_post(mixer, make_image(color='red', name='first.jpg'))
+    second = blend_post(mixer, make_image(color='red', name='second.JPG'))
+    assert first.image.name == second.image.name, (
+        'Убедитесь, что одинаковые изображения хранятся одним файлом.'
+    )
+    assert is_content_addressed(first.image.name)
+    assert first.image.name.endswith('.jpg')
+    assert ImageBlob.objects.get(name=first.image.name).refcount == 2
+    assert second.image_variants == first.image_variants
+    variant_files = [
+        media_root / variant[key]
+        for variant in first.image_variants['variants']
+        for key in ('jpeg', 'webp')
+    ]
+
+    first.delete()
+    assert (media_root / second.image.name).exists()
+    assert all(path.exists() for path in variant_files)
+
+    second.delete()
+    assert not (media_root / second.image.name).exists(), (
+        'Убедитесь, что файл удаляется вместе с последней публикацией,'
+        ' которая на него ссылается.'
+    )
+    assert not any(path.exists() for path in variant_files)
+    assert not ImageBlob.objects.exists()
+
+
+def test_replacing_image_releases_previous_file(mixer: Mixer, media_root):
+    post = blend_post(mixer, make_image(color='red'))
+    previous = post.image.name
+    post.image = make_image(color='blue')
+    post.save()
+    assert post.image.name != previous
+    assert not (media_root / previous).exists()
+    assert list(ImageBlob.objects.values_list('name', 'refcount')) == [
+        (post.image.name, 1)
+    ]
+
+
+def test_reuploading_same_image_is_counted_once(mixer: Mixer):
+    post = blend_post(mixer, make_image(color='red'))
+    post.image = make_image(color='red', name='again.jpg')
+    post.save()
+    assert list(ImageBlob.objects.values_list('name', 'refcount')) == [
+        (post.image.name, 1)
+    ]
+
+
+def test_reused_file_survives_concurrent_release(mixer: Mixer, media_root):
+    post = blend_post(mixer, make_image(color='red'))
+    storage = Post._meta.get_field('image').storage
+    # An upload that found the file before the last post let go of it.
+    name = storage.save('posts_images/photo.jpg', make_image(color='red'))
+    assert name == post.image.name
+    post.delete()
+    assert (media_root / name).exists(), (
+        'Убедитесь, что хранилище учитывает ссылку на файл до того, как'
+        ' использовать уже сохранённый файл.'
+    )
+    assert ImageBlob.objects.get(name=name).refcount == 1
+
+
+def test_import_rebuilds_image_references(mixer: Mixer):
+    post = blend_post(mixer, make_image(color='red'))
+    mixer.blend('blog.Post', image=post.image.name)
+    stream = StringIO()
+    export_blog(stream)
+    for model in reversed(BACKUP_MODELS):
+        model.objects.all().delete()
+    assert not ImageBlob.objects.exists()
+
+    stream.seek(0)
+    import_blog(stream)
+    assert list(ImageBlob.objects.values_list('name', 'refcount')) == [
+        (post.image.name, 2)
+    ], (
+        'Убедитесь, что после загрузки выгрузки количество ссылок на'
+        ' файлы изображений восстановлено.'
+    )
+
+
+def test_dedupe_command_moves_legacy_uploads(mixer: Mixer, media_root):
+    post = mixer.blend('blog.Post', image=make_image(color='green'))
+    legacy = 'posts_images/legacy.jpg'
+    (media_root / legacy).write_bytes(
+        (media_root / post.image.name).read_bytes()
+    )
+    Post.objects.update(image=legacy)
+    ImageBlob.objects.all().delete()
+
+    call_command('dedupe_post_images', stdout=StringIO())
+    post.refresh_from_db()
+    assert is_content_addressed(post.image.name)
+    assert not (media_root / legacy).exists()
+    assert ImageBlob.objects.get(name=post.image.name).refcount == 1
+
+
+@override_settings(
+    MEDIA_URL='/media/',
+    STATIC_CACHE_MAX_AGE=60,
+    MEDIA_CACHE_MAX_AGE=60,
+    IMMUTABLE_CACHE_MAX_AGE=31536000,
+)
+def test_content_addressed_media_is_cached_as_immutable():
+    middleware = StaticCacheControlMiddleware(lambda request: HttpResponse())
+    digest = 'a' * 64
+    response = middleware(
+        RequestFactory().get(f'/media/posts_images/aa/{digest}.jpg')
+    )
+    assert 'immutable' in response['Cache-Control']
+    assert 'max-age=31536000' in response['Cache-Control']
+    response = middleware(
+        RequestFactory().get('/media/posts_images/photo.jpg')
+    )
+    assert response['Cache-Control'] == 'public, max-age=60'
@@ -0,0 +1,163 @@
+from io import BytesIO, StringIO
+from unittest import mock
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog.image_jobs import MAX_ATTEMPTS
+from blog.models import ImageJob, Post
+from fixtures.images import make_image, process_image_jobs
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('media_root')]
+
+
+@pytest.fixture
+def post_with_large_image(
+        mixer: Mixer, user, published_location, published_category):
+    post = mixer.blend(
+        'blog.Post',
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=make_image(1500, 1000),
+    )
+    process_image_jobs()
+    post.refresh_from_db()
+    return post
+
+
+def test_variants_are_generated_on_save(post_with_large_image, media_root):
+    post = Post.objects.get(pk=post_with_large_image.pk)
+    variants = post.image_variants['variants']
+    assert [variant['width'] for variant in variants] == [320, 640, 1280]
+    assert variants[0]['height'] == 213
+    for variant in variants:
+        for key, image_format in (('jpeg', 'JPEG'), ('webp', 'WEBP')):
+            with Image.open(media_root / variant[key]) as image:
+                assert image.format == image_format
+                assert image.width == variant['width']
+
+
+def test_templates_use_srcset(client, post_with_large_image):
+    post = post_with_large_image
+    content = client.get(f'/posts/{post.id}/').content.decode()
+    assert '_640w.webp 640w, ' in content and '_1280w.webp 1280w' in content
+    assert 'width="640" height="427"' in content, (
+        'Убедитесь, что изображение на странице публикации выводится'
+        ' с атрибутами `srcset`, `width` и `height`.'
+    )
+    content = client.get('/').content.decode()
+    assert '_320w.jpg 320w, ' in content and '1280w' not in content
+
+
+def test_small_images_are_not_upscaled(
+        mixer: Mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image(200, 100),
+    )
+    process_image_jobs()
+    post.refresh_from_db()
+    assert [
+        variant['width'] for variant in post.image_variants['variants']
+    ] == [200]
+    assert post.card_image.srcset.endswith(' 200w')
+
+
+def test_image_metadata_is_stored_on_save(post_with_large_image):
+    post = Post.objects.get(pk=post_with_large_image.pk)
+    assert (post.image_width, post.image_height) == (1500, 1000)
+    assert post.image_placeholder.startswith('data:image/jpeg;base64,')
+    assert len(post.image_placeholder) < 1024
+
+
+def test_metadata_follows_stored_image_change(
+        mixer: Mixer, post_with_large_image):
+    other = mixer.blend('blog.Post', image=make_image(200, 100))
+    post = post_with_large_image
+    post.image = other.image.name
+    post.save()
+    post.refresh_from_db()
+    assert (post.image_width, post.image_height) == (200, 100), (
+        'Убедитесь, что размеры изображения обновляются, когда публикации'
+        ' назначается другой сохранённый файл.'
+    )
+
+
+def test_metadata_follows_exif_orientation(mixer: Mixer):
+    img_io = BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.new('RGB', (300, 200)).save(img_io, format='JPEG', exif=exif)
+    post = mixer.blend('blog.Post', image=ImageFile(img_io, name='a.jpg'))
+    assert (post.image_width, post.image_height) == (200, 300)
+    post.image = None
+    post.save()
+    assert post.image_width is None and post.image_placeholder == ''
+
+
+def test_templates_do_not_open_images(client, post_with_large_image):
+    post = post_with_large_image
+    Post.objects.filter(pk=post.pk).update(image_variants={})
+    with mock.patch.object(Image, 'open', side_effect=AssertionError):
+        feed = client.get('/').content.decode()
+        detail = client.get(f'/posts/{post.pk}/').content.decode()
+    assert 'width="1500" height="1000" loading="lazy"' in feed, (
+        'Убедитесь, что в ленте у изображения публикации указаны размеры'
+        ' и атрибут `loading="lazy"`.'
+    )
+    assert post.image_placeholder in feed
+    assert 'width="1500" height="1000" loading="eager"' in detail
+    assert post.image_placeholder in detail
+
+
+def test_backfill_command_generates_missing_variants(post_with_large_image):
+    Post.objects.update(
+        image_variants={}, image_width=None, image_placeholder=''
+    )
+    call_command('generate_image_variants', stdout=StringIO())
+    post = Post.objects.get(pk=post_with_large_image.pk)
+    assert post.image_width == 1500 and post.image_placeholder
+    assert post.image_variants['source'] == post.image.name
+    assert len(post.image_variants['variants']) == 3
+
+
+def test_variants_are_rendered_off_request_in_a_pool(
+        client, mixer: Mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image(800, 600),
+    )
+    assert not post.image_variants
+    assert ImageJob.objects.filter(post=post).exists(), (
+        'Убедитесь, что при сохранении публикации обработка изображения'
+        ' ставится в очередь, а не выполняется в запросе.'
+    )
+    content = client.get(f'/posts/{post.id}/').content.decode()
+    assert f'src="{post.image.url}"' in content, (
+        'Убедитесь, что до обработки выводится исходное изображение.'
+    )
+
+    process_image_jobs(workers=2)
+    post.refresh_from_db()
+    assert [
+        variant['width'] for variant in post.image_variants['variants']
+    ] == [320, 640, 800]
+    assert not ImageJob.objects.exists()
+
+
+def test_failed_jobs_are_retried_then_marked(
+        mixer: Mixer, user, published_category, media_root):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image(400, 300),
+    )
+    (media_root / post.image.name).write_bytes(b'not an image')
+    for _ in range(MAX_ATTEMPTS):
+        process_image_jobs()
+    job = ImageJob.objects.get(post=post)
+    assert job.status == ImageJob.FAILED
+    assert job.attempts == MAX_ATTEMPTS
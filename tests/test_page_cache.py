@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+# The database fallback of settings_prod, shared by every worker process.
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'blogicum_cache',
+    }
+}
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+    )
+
+
+@pytest.mark.usefixtures('many_posts_with_published_locations')
+def test_anonymous_feed_pages_are_cached(
+        client, feed_urls, django_assert_num_queries):
+    for url in feed_urls:
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.content == first.content, (
+            f'Убедитесь, что страница `{url}` для анонимных пользователей'
+            ' отдаётся из кэша.'
+        )
+
+
+@pytest.mark.usefixtures('many_posts_with_published_locations')
+def test_authenticated_users_bypass_page_cache(user_client, feed_urls):
+    for url in feed_urls:
+        user_client.get(url)
+        response = user_client.get(url)
+        assert response.context is not None, (
+            f'Убедитесь, что страница `{url}` не кэшируется для'
+            ' авторизованных пользователей.'
+        )
+
+
+def test_page_cache_invalidated_by_changes(
+        client, mixer: Mixer, user, published_category,
+        post_with_published_location, feed_urls):
+    for url in feed_urls:
+        client.get(url)
+    comment = mixer.blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    for url in feed_urls:
+        assert 'Комментарии (1)' in client.get(url).content.decode(), (
+            f'Убедитесь, что кэш страницы `{url}` сбрасывается при'
+            ' добавлении комментария.'
+        )
+    comment.delete()
+    published_category.title = 'Новое название категории'
+    published_category.save()
+    response = client.get(feed_urls[1])
+    assert published_category.title in response.content.decode()
+
+
+def test_scheduled_post_appears_when_publication_time_passes(
+        client, mixer: Mixer, user, published_category, feed_urls,
+        monkeypatch):
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    for url in feed_urls:
+        assert post.title not in client.get(url).content.decode()
+
+    later = timezone.now() + timedelta(hours=2)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    for url in feed_urls:
+        assert post.title in client.get(url).content.decode(), (
+            f'Убедитесь, что отложенная публикация появляется на странице'
+            f' `{url}`, когда наступает время её публикации.'
+        )
+
+
+def test_page_cache_is_invalidated_across_workers(
+        client, mixer: Mixer, user, published_category, feed_urls,
+        monkeypatch):
+    with override_settings(CACHES=SHARED_CACHES):
+        call_command('createcachetable', verbosity=0)
+        # Cache client of another worker process writing to the same
+        # backend.
+        worker_cache = caches.create_connection('default')
+        for url in feed_urls:
+            client.get(url)
+        monkeypatch.setattr('blog.cache.cache', worker_cache)
+        monkeypatch.setattr('blog.publication.cache', worker_cache)
+        post = mixer.blend(
+            'blog.Post',
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(minutes=1),
+        )
+        monkeypatch.undo()
+        for url in feed_urls:
+            assert post.title in client.get(url).content.decode(), (
+                f'Убедитесь, что кэш страницы `{url}` сбрасывается во всех'
+                ' процессах после изменения в одном из них.'
+            )
+
+
+def test_publication_epoch_is_rechecked_when_old(
+        mixer: Mixer, user, published_category, monkeypatch, settings):
+    from blog.models import Post
+    from blog.utils import select_posts
+
+    assert not select_posts(for_public=True).exists()
+    # bulk_create sends no signals, like a write from another process
+    # that could not advance the epoch.
+    Post.objects.bulk_create([Post(
+        title='Без сигналов',
+        text='Текст',
+        author=user,
+        category=published_category,
+        pub_date=timezone.now(),
+    )])
+    assert not select_posts(for_public=True).exists()
+
+    later = timezone.now() + timedelta(
+        seconds=settings.PUBLICATION_EPOCH_MAX_AGE + 1
+    )
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    assert list(
+        select_posts(for_public=True).values_list('title', flat=True)
+    ) == ['Без сигналов'], (
+        'Убедитесь, что эпоха публикации пересчитывается, когда она'
+        ' старше PUBLICATION_EPOCH_MAX_AGE.'
+    )
@@ -0,0 +1,236 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.pagination import CachedCountPaginator, estimate_count
+from blog.views import PAGES_ON_EACH_SIDE, PAGES_ON_ENDS
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts_with_shared_dates(mixer: Mixer, user, published_category):
+    # Pairs of posts share a publication date to exercise the id tie-break.
+    now = timezone.now()
+    pub_dates = (
+        now - timedelta(hours=i // 2) for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=pub_dates,
+    )
+
+
+def test_cursor_pagination_walks_feed(client, posts_with_shared_dates):
+    expected = sorted(
+        posts_with_shared_dates,
+        key=lambda post: (post.pub_date, post.pk),
+        reverse=True,
+    )
+    seen = []
+    pages = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get('/', {'cursor': cursor})
+        assert response.status_code == 200, (
+            'Убедитесь, что лента открывается в режиме курсорной пагинации.'
+        )
+        page = response.context['page_obj']
+        assert len(page) <= N_PER_PAGE
+        seen.extend(post.pk for post in page)
+        pages.append([post.pk for post in page])
+        cursor = page.next_cursor
+    assert seen == [post.pk for post in expected], (
+        'Убедитесь, что курсорная пагинация выдаёт все публикации ровно один'
+        ' раз в порядке убывания даты публикации.'
+    )
+
+    cursor = page.previous_cursor
+    for expected_page in reversed(pages[:-1]):
+        page = client.get('/', {'cursor': cursor}).context['page_obj']
+        assert [post.pk for post in page] == expected_page, (
+            'Убедитесь, что ссылка на предыдущую страницу возвращает'
+            ' те же публикации, что и при переходе вперёд.'
+        )
+        cursor = page.previous_cursor
+    assert cursor is None
+
+
+def test_cursor_pagination_rejects_invalid_cursor(client):
+    response = client.get('/', {'cursor': 'not-a-cursor'})
+    assert response.status_code == 404
+
+
+@pytest.mark.usefixtures('posts_with_shared_dates')
+def test_page_number_pagination_still_works(client):
+    response = client.get('/', {'page': 2})
+    assert response.status_code == 200
+    assert response.context['page_obj'].number == 2
+
+
+def test_long_feed_renders_elided_page_window(
+        client, user, published_category):
+    pages = 30
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {number}',
+            text='Текст',
+            author=user,
+            category=published_category,
+            pub_date=now - timedelta(hours=number + 1),
+        )
+        for number in range(N_PER_PAGE * pages)
+    )
+    middle = pages // 2
+    content = client.get('/', {'page': middle}).content.decode()
+    assert content.count('<span class="page-link">…</span>') == 2, (
+        'Убедитесь, что на средней странице длинной ленты пропущенные'
+        ' номера страниц заменены многоточием с обеих сторон.'
+    )
+    for page in (1, PAGES_ON_ENDS, pages - PAGES_ON_ENDS + 1, pages):
+        assert f'href="?page={page}"' in content
+    for page in range(middle - PAGES_ON_EACH_SIDE,
+                      middle + PAGES_ON_EACH_SIDE + 1):
+        assert (
+            f'href="?page={page}"' in content
+            or f'<span class="page-link">{page}</span>' in content
+        )
+    assert f'href="?page={middle - PAGES_ON_EACH_SIDE - 2}"' not in content
+    # First, previous, the window, its ends, two ellipses, next, last.
+    max_items = 4 + 2 * PAGES_ON_EACH_SIDE + 1 + 2 * PAGES_ON_ENDS + 2
+    assert content.count('<li class="page-item') <= max_items, (
+        'Убедитесь, что число ссылок в пагинаторе не растёт с длиной'
+        ' ленты.'
+    )
+
+
+def count_queries_in(ctx):
+    return sum('COUNT(' in query['sql'] for query in ctx.captured_queries)
+
+
+def test_post_count_is_cached_and_invalidated(
+        user_client, mixer: Mixer, user, published_category,
+        posts_with_shared_dates):
+    with CaptureQueriesContext(connection) as first:
+        user_client.get('/')
+    with CaptureQueriesContext(connection) as second:
+        response = user_client.get('/')
+    assert count_queries_in(first) == 1
+    assert count_queries_in(second) == 0, (
+        'Убедитесь, что количество публикаций в ленте берётся из кэша.'
+    )
+    paginator = response.context['paginator']
+    assert paginator.count == len(posts_with_shared_dates)
+
+    mixer.blend('blog.Post', author=user, category=published_category)
+    response = user_client.get('/')
+    assert response.context['paginator'].count == (
+        len(posts_with_shared_dates) + 1
+    ), 'Убедитесь, что кэш количества публикаций сбрасывается.'
+
+
+class FakeExplainCursor:
+    """Cursor that answers EXPLAIN like PostgreSQL does."""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+
+    def fetchone(self):
+        return (self.plan,)
+
+
+@pytest.mark.parametrize(
+    'plan',
+    [
+        [{'Plan': {'Plan Rows': 250000}}],
+        '[{"Plan": {"Plan Rows": 250000}}]',
+    ],
+    ids=['parsed', 'text'],
+)
+def test_estimate_count_reads_postgresql_plan(monkeypatch, plan):
+    queryset = Post.objects.filter(is_published=True)
+    assert estimate_count(queryset) is None, (
+        'Убедитесь, что на SQLite используется точный подсчёт.'
+    )
+    cursor = FakeExplainCursor(plan)
+    db = connections[queryset.db]
+    monkeypatch.setattr(db, 'vendor', 'postgresql')
+    monkeypatch.setattr(db, 'cursor', lambda: cursor)
+    assert estimate_count(queryset) == 250000
+    assert cursor.executed[0].startswith('EXPLAIN (FORMAT JSON) SELECT')
+
+
+@pytest.mark.usefixtures('posts_with_shared_dates')
+def test_large_feeds_use_planner_estimate(monkeypatch, settings):
+    settings.POST_COUNT_ESTIMATE_THRESHOLD = 1000
+    posts = Post.objects.order_by('pk')
+    monkeypatch.setattr(
+        'blog.pagination.estimate_count', lambda queryset: 5000
+    )
+    paginator = CachedCountPaginator(
+        posts, N_PER_PAGE, count_signature='large'
+    )
+    assert paginator.count == 5000
+    monkeypatch.setattr(
+        'blog.pagination.estimate_count', lambda queryset: 999
+    )
+    paginator = CachedCountPaginator(
+        posts, N_PER_PAGE, count_signature='small'
+    )
+    assert paginator.count == posts.count(), (
+        'Убедитесь, что небольшие выборки считаются точно.'
+    )
+
+
+def test_comments_are_served_in_keyset_pages(
+        client, mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(45).blend('blog.Comment', post=post)
+    response = client.get(f'/posts/{post.id}/')
+    page = response.context['comments']
+    seen = [comment.pk for comment in page]
+    while page.has_next():
+        response = client.get(
+            f'/posts/{post.id}/comments/',
+            {'cursor': page.next_cursor},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        assert response.status_code == 200
+        assert '<html' not in response.content.decode(), (
+            'Убедитесь, что для асинхронных запросов страница комментариев'
+            ' возвращает только фрагмент со списком.'
+        )
+        page = response.context['comments']
+        seen.extend(comment.pk for comment in page)
+    assert seen == [comment.pk for comment in comments], (
+        'Убедитесь, что постраничная загрузка выдаёт все комментарии'
+        ' ровно один раз в порядке добавления.'
+    )
+
+
+def test_comments_page_renders_standalone(
+        client, mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post, text='Отдельная страница')
+    response = client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == 200
+    assert 'Отдельная страница' in response.content.decode()
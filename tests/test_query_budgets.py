@@ -0,0 +1,116 @@
+import pytest
+from django.urls import URLPattern, URLResolver
+from mixer.backend.django import Mixer
+
+from blog import urls as blog_urls
+from conftest import N_PER_PAGE
+from fixtures.queries import QUERY_BUDGETS
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_view_names(patterns, namespace):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from get_view_names(pattern.url_patterns, namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f'{namespace}:{pattern.name}'
+
+
+def test_every_blog_view_has_query_budget():
+    view_names = set(
+        get_view_names(blog_urls.urlpatterns, blog_urls.app_name)
+    )
+    assert view_names <= set(QUERY_BUDGETS), (
+        'Укажите допустимое количество запросов к базе данных в'
+        ' `QUERY_BUDGETS` для представлений:'
+        f' {", ".join(sorted(view_names - set(QUERY_BUDGETS)))}.'
+    )
+
+
+@pytest.fixture
+def budget_kwargs(mixer: Mixer, user, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    return {
+        'blog:index': {},
+        'blog:category_posts': {'category_slug': post.category.slug},
+        'blog:profile': {'username': user.username},
+        'blog:post_detail': {'post_id': post.id},
+        'blog:post_comments': {'post_id': post.id},
+        'blog:create_post': {},
+        'blog:edit_post': {'post_id': post.id},
+        'blog:delete_post': {'post_id': post.id},
+        'blog:add_comment': {'post_id': post.id},
+        'blog:edit_comment': {'post_id': post.id, 'comment_id': comment.id},
+        'blog:delete_comment': {
+            'post_id': post.id, 'comment_id': comment.id,
+        },
+        'blog:edit_profile': {},
+    }
+
+
+@pytest.mark.parametrize('view_name', sorted(QUERY_BUDGETS))
+def test_view_stays_within_query_budget(
+        user_client, assert_query_budget, budget_kwargs, view_name):
+    if view_name == 'blog:add_comment':
+        assert_query_budget(
+            user_client, view_name, method='post', data={'text': 'Текст'},
+            **budget_kwargs[view_name],
+        )
+    else:
+        assert_query_budget(
+            user_client, view_name, **budget_kwargs[view_name],
+        )
+
+
+@pytest.mark.parametrize(
+    'view_name', ('blog:index', 'blog:category_posts', 'blog:profile')
+)
+def test_list_queries_do_not_grow_with_page_size(
+        mixer: Mixer, user, user_client, published_location,
+        published_category, assert_query_budget, view_name):
+    kwargs = {
+        'blog:index': {},
+        'blog:category_posts': {'category_slug': published_category.slug},
+        'blog:profile': {'username': user.username},
+    }[view_name]
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+    )
+    with_one_post = assert_query_budget(user_client, view_name, **kwargs)
+    mixer.cycle(N_PER_PAGE).blend(
+        'blog.Post', author=mixer.blend('auth.User'),
+        category=published_category, location=mixer.blend('blog.Location'),
+    )
+    with_full_page = assert_query_budget(user_client, view_name, **kwargs)
+    assert len(with_full_page) == len(with_one_post), (
+        f'Убедитесь, что количество запросов к базе данных на странице'
+        f' `{view_name}` не зависит от количества публикаций на ней.'
+    )
+
+
+@pytest.mark.parametrize(
+    'view_name', ('blog:post_detail', 'blog:post_comments')
+)
+def test_comment_queries_do_not_grow_with_comment_count(
+        mixer: Mixer, user_client, post_with_published_location,
+        assert_query_budget, view_name):
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post)
+    with_one_comment = assert_query_budget(
+        user_client, view_name, post_id=post.id,
+    )
+    mixer.cycle(N_PER_PAGE * 3).blend(
+        'blog.Comment', post=post, author=mixer.sequence(
+            *mixer.cycle(N_PER_PAGE * 3).blend('auth.User')
+        ),
+    )
+    with_many_comments = assert_query_budget(
+        user_client, view_name, post_id=post.id,
+    )
+    assert len(with_many_comments) == len(with_one_comment), (
+        f'Убедитесь, что количество запросов к базе данных на странице'
+        f' `{view_name}` не зависит от количества комментариев.'
+    )
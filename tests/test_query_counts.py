@@ -0,0 +1,90 @@
+import pytest
+from mixer.backend.django import Mixer
+
+from fixtures.queries import capture_queries, get_page_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_detail_queries_do_not_grow_with_comments(
+        mixer: Mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    mixer.blend('blog.Comment', post=post)
+    with_one_comment = get_page_queries(user_client, url)
+    mixer.cycle(10).blend('blog.Comment', post=post)
+    with_many_comments = get_page_queries(user_client, url)
+    assert len(with_many_comments) == len(with_one_comment), (
+        'Убедитесь, что количество запросов к базе данных на странице'
+        ' публикации не зависит от количества комментариев.'
+    )
+    comment_queries = [
+        sql for sql in with_many_comments if 'FROM "blog_comment"' in sql
+    ]
+    assert len(comment_queries) == 1, (
+        'Убедитесь, что комментарии к публикации вместе с авторами'
+        ' загружаются одним запросом.'
+    )
+
+
+@pytest.mark.usefixtures('many_posts_with_published_locations')
+def test_list_views_look_up_category_and_profile_once(
+        user_client, user, published_category):
+    category_url = f'/category/{published_category.slug}/'
+    category_queries = [
+        sql for sql in get_page_queries(user_client, category_url)
+        if sql.startswith('SELECT') and 'FROM "blog_category"' in sql
+    ]
+    assert len(category_queries) == 1, (
+        'Убедитесь, что категория загружается один раз за запрос.'
+    )
+    assert not [
+        sql for sql in get_page_queries(user_client, category_url)
+        if 'FROM "blog_category"' in sql
+    ], 'Убедитесь, что опубликованные категории кэшируются между запросами.'
+
+    profile_url = f'/profile/{user.username}/'
+    profile_queries = [
+        sql for sql in get_page_queries(user_client, profile_url)
+        if '"auth_user"."username" =' in sql
+    ]
+    assert len(profile_queries) == 1, (
+        'Убедитесь, что профиль пользователя загружается один раз за запрос.'
+    )
+
+
+def test_edit_and_delete_views_fetch_object_once(
+        mixer: Mixer, user, user_client, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    urls = (
+        (f'/posts/{post.id}/edit_comment/{comment.id}/', 'blog_comment'),
+        (f'/posts/{post.id}/delete_comment/{comment.id}/', 'blog_comment'),
+        (f'/posts/{post.id}/edit/', 'blog_post'),
+        (f'/posts/{post.id}/delete/', 'blog_post'),
+    )
+    for url, table in urls:
+        selects = [
+            sql for sql in get_page_queries(user_client, url)
+            if sql.startswith(f'SELECT "{table}"')
+        ]
+        assert len(selects) == 1, (
+            f'Убедитесь, что страница `{url}` загружает объект из базы'
+            ' данных один раз.'
+        )
+    _, queries = capture_queries(
+        user_client,
+        f'/posts/{post.id}/edit_comment/{comment.id}/',
+        'post',
+        data={'text': 'Изменённый комментарий'},
+    )
+    selects = [
+        sql for sql in queries
+        if sql.startswith(
+            ('SELECT "blog_comment"', 'SELECT "blog_post"')
+        )
+    ]
+    assert len(selects) == 1, (
+        'Убедитесь, что при редактировании комментария он и его публикация'
+        ' загружаются одним запросом.'
+    )
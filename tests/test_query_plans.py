@@ -0,0 +1,58 @@
+import re
+
+import pytest
+from django.db import connection
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+from fixtures.queries import get_page_queries
+
+pytestmark = [pytest.mark.django_db]
+
+FULL_SCAN_RE = re.compile(
+    r'SCAN (TABLE )?blog_post\b(?! USING (COVERING )?INDEX post_)'
+)
+
+
+def get_post_query_plans(client, url):
+    plans = []
+    with connection.cursor() as cursor:
+        for sql in get_page_queries(client, url):
+            if not sql.startswith('SELECT') or '"blog_post"' not in sql:
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = '\n'.join(row[-1] for row in cursor.fetchall())
+            plans.append((sql, plan))
+    return plans
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category, another_category):
+    return mixer.cycle(N_PER_PAGE * 3).blend(
+        'blog.Post',
+        author=user,
+        category=mixer.sequence(published_category, another_category),
+    )
+
+
+@pytest.mark.usefixtures('feed_posts')
+@pytest.mark.parametrize(
+    'get_url',
+    [
+        lambda user, category: '/',
+        lambda user, category: f'/category/{category.slug}/',
+        lambda user, category: f'/profile/{user.username}/',
+    ],
+    ids=['index', 'category_posts', 'profile'],
+)
+def test_feed_views_use_indexes(
+        client, user_client, user, published_category, get_url):
+    url = get_url(user, published_category)
+    for current_client in (client, user_client):
+        plans = get_post_query_plans(current_client, url)
+        assert plans, f'Страница `{url}` не запрашивает публикации.'
+        for sql, plan in plans:
+            assert not FULL_SCAN_RE.search(plan), (
+                f'Запрос страницы `{url}` читает всю таблицу публикаций '
+                f'вместо индекса.\nSQL: {sql}\nПлан: {plan}'
+            )
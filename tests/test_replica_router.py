@@ -0,0 +1,108 @@
+import time
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from blog.models import Post
+from blogicum.middleware import PRIMARY_PIN_COOKIE, ReplicaRoutingMiddleware
+from blog.cache import bump_version, reads_are_cacheable
+from blogicum.routers import (
+    ReplicaRouter,
+    enable_replica_reads,
+    reset_replica_reads,
+)
+
+DATABASES_WITH_REPLICA = {
+    **settings.DATABASES,
+    'replica': {**settings.DATABASES['default'], 'NAME': 'replica.sqlite3'},
+}
+
+
+def route_request(request):
+    used = {}
+
+    def get_response(request):
+        view = request.resolver_match
+        middleware.process_view(
+            request, view.func, view.args, view.kwargs
+        )
+        used['db'] = ReplicaRouter().db_for_read(Post)
+        return HttpResponse(status=302 if request.method == 'POST' else 200)
+
+    middleware = ReplicaRoutingMiddleware(get_response)
+    request.resolver_match = resolve(request.path)
+    response = middleware(request)
+    return used['db'], response
+
+
+@pytest.fixture
+def rf():
+    return RequestFactory()
+
+
+@override_settings(DATABASES=DATABASES_WITH_REPLICA)
+def test_read_views_use_replica(rf):
+    db, _ = route_request(rf.get('/'))
+    assert db == 'replica', (
+        'Убедитесь, что лента публикаций читает данные с реплики.'
+    )
+    assert ReplicaRouter().db_for_read(Post) == 'default', (
+        'Убедитесь, что после запроса чтение снова идёт в основную базу.'
+    )
+    assert ReplicaRouter().db_for_write(Post) == 'default'
+
+
+@override_settings(DATABASES=DATABASES_WITH_REPLICA)
+def test_other_views_use_primary(rf):
+    db, _ = route_request(rf.get('/posts/create/'))
+    assert db == 'default'
+
+
+@override_settings(DATABASES=DATABASES_WITH_REPLICA)
+def test_client_is_pinned_to_primary_after_write(rf):
+    _, response = route_request(rf.post('/posts/1/create_comment/'))
+    assert PRIMARY_PIN_COOKIE in response.cookies, (
+        'Убедитесь, что после записи клиент получает cookie, закрепляющую'
+        ' его за основной базой.'
+    )
+    request = rf.get('/posts/1/')
+    request.COOKIES[PRIMARY_PIN_COOKIE] = '1'
+    db, _ = route_request(request)
+    assert db == 'default', (
+        'Убедитесь, что запрос сразу после записи читает из основной базы.'
+    )
+
+
+@override_settings(DATABASES=DATABASES_WITH_REPLICA, REPLICA_PIN_SECONDS=10)
+def test_replica_reads_right_after_a_write_are_not_cached(
+        rf, monkeypatch):
+    bump_version('feed')
+    db, _ = route_request(rf.get('/'))
+    assert db == 'replica', (
+        'Убедитесь, что запись одного клиента не переводит остальных'
+        ' клиентов на основную базу.'
+    )
+    assert reads_are_cacheable('feed')
+    token = enable_replica_reads()
+    try:
+        assert not reads_are_cacheable('feed'), (
+            'Убедитесь, что данные, прочитанные с реплики сразу после'
+            ' записи, не попадают в кэш.'
+        )
+        # The version token keeps the bump time rounded to milliseconds.
+        later = time.time() + settings.REPLICA_PIN_SECONDS + 1
+        monkeypatch.setattr(time, 'time', lambda: later)
+        assert reads_are_cacheable('feed'), (
+            'Убедитесь, что чтения с реплики снова кэшируются, когда'
+            ' реплика догнала основную базу.'
+        )
+    finally:
+        reset_replica_reads(token)
+
+
+def test_without_replica_reads_use_primary(rf):
+    db, _ = route_request(rf.get('/'))
+    assert db == 'default'
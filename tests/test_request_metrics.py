@@ -0,0 +1,67 @@
+import importlib
+
+import pytest
+from django.conf import settings
+from django.test import Client, override_settings
+from mixer.backend.django import Mixer
+
+from blogicum import metrics
+
+pytestmark = [pytest.mark.django_db]
+
+METRICS_URL = '/internal/metrics/'
+
+
+@pytest.fixture
+def staff_client(mixer: Mixer):
+    client = Client()
+    client.force_login(mixer.blend('auth.User', is_staff=True))
+    return client
+
+
+@override_settings(
+    MIDDLEWARE=[
+        'blogicum.middleware.RequestMetricsMiddleware',
+        *settings.MIDDLEWARE,
+    ],
+    REQUEST_METRICS_SAMPLE_RATE=1.0,
+)
+def test_request_metrics_are_recorded_per_view(
+        user_client, staff_client, post_with_published_location):
+    metrics.records.clear()
+    post = post_with_published_location
+    for _ in range(3):
+        user_client.get(f'/posts/{post.id}/')
+    user_client.get('/')
+
+    response = staff_client.get(METRICS_URL)
+    assert response.status_code == 200
+    views = response.json()['views']
+    detail = views['blog:post_detail']
+    assert detail['requests'] == 3
+    assert detail['queries']['50'] > 0
+    assert detail['db_ms']['99'] <= detail['total_ms']['99']
+    assert 0 < detail['template_ms']['50'] <= detail['total_ms']['50'], (
+        'Убедитесь, что время отрисовки шаблонов входит в метрики запроса.'
+    )
+    assert detail['size']['50'] > 0
+    assert views['blog:index']['requests'] == 1
+
+
+def test_request_metrics_are_staff_only(user_client):
+    response = user_client.get(METRICS_URL)
+    assert response.status_code == 302, (
+        'Убедитесь, что страница метрик доступна только персоналу.'
+    )
+
+
+def test_static_files_are_not_sampled(monkeypatch):
+    monkeypatch.setenv('DJANGO_SECRET_KEY', 'test-secret-key')
+    middleware = importlib.import_module('blogicum.settings_prod').MIDDLEWARE
+    assert (
+        middleware.index('blogicum.middleware.RequestMetricsMiddleware')
+        > middleware.index('blogicum.middleware.StaticFilesMiddleware')
+    ), (
+        'Убедитесь, что запросы статики, которые отдаёт StaticFilesMiddleware,'
+        ' не попадают в метрики как неразрешённые.'
+    )
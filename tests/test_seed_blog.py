@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+SEEDED_MODELS = (get_user_model(), Category, Location, Post, Comment)
+# Set by auto_now_add at insert time.
+INSERT_TIME_FIELDS = {'created_at'}
+
+
+def seed_and_snapshot(**options):
+    with transaction.atomic():
+        call_command(
+            'seed_blog', users=5, categories=3, locations=3, posts=20,
+            comments=40, stdout=StringIO(), **options,
+        )
+        snapshot = {
+            model._meta.label: list(model.objects.order_by('pk').values_list(
+                *(
+                    field.attname
+                    for field in model._meta.concrete_fields
+                    if field.name not in INSERT_TIME_FIELDS
+                )
+            ))
+            for model in SEEDED_MODELS
+        }
+        # Undoes the rows and the id sequences for the next run.
+        transaction.set_rollback(True)
+    return snapshot
+
+
+def test_same_seed_gives_same_rows():
+    first = seed_and_snapshot(seed=3)
+    assert len(first[Post._meta.label]) == 20
+    assert seed_and_snapshot(seed=3) == first, (
+        'Убедитесь, что seed_blog с одинаковым --seed создаёт одинаковые'
+        ' данные.'
+    )
+    assert seed_and_snapshot(seed=4) != first
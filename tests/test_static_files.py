@@ -0,0 +1,110 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blogicum.middleware import StaticFilesMiddleware
+from blogicum.staticfiles import brotli, get_accepted_encodings
+
+# Closing a response sends request_finished, which closes connections.
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(scope='module')
+def static_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp('static')
+    with override_settings(
+        STATIC_ROOT=root,
+        STATICFILES_STORAGE=(
+            'blogicum.staticfiles.CompressedManifestStaticFilesStorage'
+        ),
+    ):
+        call_command('collectstatic', interactive=False, verbosity=0)
+    return root
+
+
+@pytest.fixture
+def middleware(static_root):
+    with override_settings(
+        STATIC_ROOT=static_root,
+        STATIC_URL='/static/',
+        SERVE_STATIC=True,
+        STATIC_CACHE_MAX_AGE=60,
+        IMMUTABLE_CACHE_MAX_AGE=31536000,
+    ):
+        yield StaticFilesMiddleware(lambda request: HttpResponse('app'))
+
+
+def get_hashed_name(static_root, name):
+    manifest = json.loads((static_root / 'staticfiles.json').read_text())
+    return manifest['paths'][name]
+
+
+def test_collectstatic_writes_compressed_siblings(static_root):
+    css = get_hashed_name(static_root, 'css/bootstrap.min.css')
+    assert css != 'css/bootstrap.min.css'
+    original = (static_root / css).read_bytes()
+    assert gzip.decompress(
+        (static_root / f'{css}.gz').read_bytes()
+    ) == original, (
+        'Убедитесь, что `collectstatic` создаёт сжатые `.gz`-копии'
+        ' статических файлов.'
+    )
+    assert (static_root / f'{css}.br').exists() == (brotli is not None)
+    png = get_hashed_name(static_root, 'img/fav/favicon-32x32.png')
+    assert not (static_root / f'{png}.gz').exists()
+
+
+def test_static_files_are_served_precompressed(static_root, middleware):
+    css = get_hashed_name(static_root, 'css/bootstrap.min.css')
+    request = RequestFactory().get(
+        f'/static/{css}', HTTP_ACCEPT_ENCODING='gzip, deflate'
+    )
+    response = middleware(request)
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Content-Type'] == 'text/css'
+    assert response['Vary'] == 'Accept-Encoding'
+    assert 'immutable' in response['Cache-Control']
+    assert 'max-age=31536000' in response['Cache-Control']
+    assert gzip.decompress(
+        b''.join(response.streaming_content)
+    ) == (static_root / css).read_bytes()
+    response.close()
+
+    response = middleware(RequestFactory().get(
+        f'/static/{css}', HTTP_ACCEPT_ENCODING='gzip;q=0, br'
+    ))
+    if brotli is None:
+        assert 'Content-Encoding' not in response
+        assert int(response['Content-Length']) == (
+            (static_root / css).stat().st_size
+        )
+    else:
+        assert response['Content-Encoding'] == 'br'
+    response.close()
+
+    response = middleware(RequestFactory().get(
+        f'/static/{css}', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    ))
+    assert response.status_code == 304
+
+
+def test_unhashed_and_unknown_paths(middleware):
+    response = middleware(RequestFactory().get('/static/img/logo.png'))
+    assert 'Content-Encoding' not in response
+    assert response['Content-Type'] == 'image/png'
+    assert response['Cache-Control'] == 'public, max-age=60'
+    response.close()
+    for path in ('/static/missing.css', '/static/../manage.py', '/'):
+        response = middleware(RequestFactory().get(path))
+        assert response.content == b'app'
+
+
+def test_get_accepted_encodings():
+    assert get_accepted_encodings('gzip, br;q=0.5, deflate;q=0') == {
+        'gzip', 'br',
+    }
+    assert get_accepted_encodings('') == set()